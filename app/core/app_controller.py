@@ -1,9 +1,11 @@
+import contextlib
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
-from queue import Queue, Empty
-from datetime import datetime
+import pyodbc
+from concurrent.futures import ThreadPoolExecutor
 import os
+import time
+from types import MappingProxyType
 
 from app.ui.components.connection_ui import ConnectionUI
 from app.ui.components.main_ui import MainUI
@@ -13,31 +15,52 @@ from app.database.connection import DatabaseManager
 from app.database.query_executor import QueryExecutor
 from app.utils.query_history import QueryHistoryManager
 from app.utils.file_operations import FileOperationsManager
+from app.utils.result_cache import ResultCache, fingerprint
 from app.utils.validators import QueryValidator
-from app.core.config import AppConfig
+from app.core.config import AppConfig, THEME
 
 
 class SQLToolApp:
+    # Fixed attribute layout; UI components read these on every refresh
+    __slots__ = (
+        "root", "conn", "current_db", "db_vars", "db_checkbuttons",
+        "query_running", "current_query", "connection_details",
+        "connection_epoch", "_server_info", "_databases_future",
+        # Theme
+        "theme", "logo_image",
+        # Managers
+        "style_manager", "db_manager", "history_manager", "executor", "statement_executor",
+        "result_cache", "query_executor", "file_manager",
+        # UI
+        "connection_ui", "main_ui",
+    )
+
     def __init__(self, root):
         self.root = root
         # Initialize basic attributes first
         self.conn = None
-        self.current_server = None
         self.current_db = None
         self.db_vars = {}
         self.db_checkbuttons = {}
-        self.message_queue = Queue()
-        self.query_history = []
         self.query_running = False
         self.current_query = None
         
         # Store connection details for display
         self.connection_details = None
+        # Bumped on connect/disconnect so the UI can tell when its status is stale
+        self.connection_epoch = 0
+        self._server_info = None
+        # Database list fetched in the background while the UI switches over
+        self._databases_future = None
         
         self.setup_application()
         self.initialize_managers()
         self.initialize_ui()
-        self.check_queue()  # Start queue checking
+
+    @property
+    def current_server(self):
+        """Server config of the active connection, owned by the database manager"""
+        return self.db_manager.current_server
 
     def setup_application(self):
         """Complete application setup logic"""
@@ -46,46 +69,45 @@ class SQLToolApp:
         self.root.geometry("1200x800")  # Adjusted size for login window
         self.root.resizable(False, False)  # Prevent resizing for login window
         
-        # Set colors and fonts from config
-        self.bg_color = AppConfig.COLORS['bg_color']
-        self.primary_color = AppConfig.COLORS['primary_color']
-        self.muted_color = AppConfig.COLORS['muted_color']
-        self.success_color = AppConfig.COLORS['success_color']
-        self.accent_color = AppConfig.COLORS['accent_color']
-        self.border_color = AppConfig.COLORS['border_color']
-        self.card_bg = AppConfig.COLORS['card_bg']
-        self.light_gray = AppConfig.COLORS['light_gray']
-        self.dark_bg = AppConfig.COLORS['dark_bg']
-        self.error_color = AppConfig.COLORS['error_color']
-        self.warning_color = AppConfig.COLORS['warning_color']
-
-        # Font definitions
-        self.font_normal = AppConfig.FONTS['normal']
-        self.font_bold = AppConfig.FONTS['bold']
-        self.font_label = AppConfig.FONTS['label']
-        self.font_header = AppConfig.FONTS['header']
-        self.font_database = AppConfig.FONTS['database']
-        self.font_subtitle = AppConfig.FONTS['subtitle']
-        self.font_small = AppConfig.FONTS['small']
+        # Colors and fonts shared with every UI component
+        self.theme = THEME
 
         # Create logo
         self.logo_image = LogoHandler.create_logo_placeholder()
         
         # Configure root background
-        self.root.configure(bg=self.bg_color)
+        self.root.configure(bg=self.theme.bg_color)
 
     def initialize_managers(self):
         """Initialize all manager classes"""
         self.style_manager = StyleManager(self.root, self)
         self.db_manager = DatabaseManager()
         self.history_manager = QueryHistoryManager()
-        self.query_executor = QueryExecutor(self.db_manager, self.message_queue)
+        # Shared worker pool for connection attempts and per-database query fan-out
+        pool_size = min(32, (os.cpu_count() or 4) * 2)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sql")
+        # Kept apart from the shared pool so database workers never wait on their own pool
+        self.statement_executor = ThreadPoolExecutor(
+            max_workers=AppConfig.THREADING['max_statement_workers'], thread_name_prefix="sql-stmt"
+        )
+        self.result_cache = ResultCache(
+            ttl=AppConfig.CACHE['result_ttl'],
+            max_entries=AppConfig.CACHE['result_max_entries']
+        )
+        # The query driver itself occupies one pool thread, leave it out of the fan-out
+        self.query_executor = QueryExecutor(
+            self.db_manager, self.post_message, self.executor, self.result_cache,
+            max_workers=max(1, min(AppConfig.THREADING['max_db_workers'], pool_size - 1)),
+            commit_mode=AppConfig.QUERY['commit_mode'],
+            max_display_rows=AppConfig.QUERY['max_display_rows'],
+            statement_executor=self.statement_executor
+        )
         self.file_manager = FileOperationsManager()
         
     def initialize_ui(self):
         """Initialize UI components"""
-        self.connection_ui = ConnectionUI(self.root, self)
-        self.main_ui = MainUI(self.root, self)
+        self.connection_ui = ConnectionUI(self.root, self, self.theme)
+        self.main_ui = MainUI(self.root, self, self.theme)
         self.connection_ui.show()
 
     # Connection methods
@@ -104,34 +126,37 @@ class SQLToolApp:
             'username': username,
             'password': password
         }
+        self._invalidate_server_info()
             
         self.db_manager.set_server_config(server, username, password)
-        self.current_server = self.db_manager.current_server
         
-        # Start connection attempt in thread
-        threading.Thread(target=self.attempt_connection, daemon=True).start()
+        # Run connection attempt on the worker pool
+        self.executor.submit(self.attempt_connection)
 
     def attempt_connection(self):
         """Attempt to connect to server with better error handling"""
         success, message = self.db_manager.test_connection()
         
         if success:
-            self.message_queue.put(("success", message))
+            # Fetch the database list during the success delay before the switch to main UI
+            self._databases_future = self.executor.submit(self.db_manager.get_databases)
+            self.post_message("success", message)
         else:
-            self.message_queue.put(("error", f"Connection failed: {message}"))
+            self.post_message("error", f"Connection failed: {message}")
 
     def disconnect_server(self):
         """Disconnect from the current server"""
         if self.conn:
-            try:
+            with contextlib.suppress(pyodbc.Error):
                 self.conn.close()
-            except:
-                pass
-            finally:
-                self.conn = None
-                
-        self.current_server = None
+            self.conn = None
+
+        self._databases_future = None
+        self.db_manager.clear_server_config()
+        self.db_manager.clear_cache()
+        self.result_cache.clear()
         self.connection_details = None
+        self._invalidate_server_info()
         self.db_vars = {}
         
         # Switch back to connection UI and restore login window size
@@ -165,11 +190,21 @@ class SQLToolApp:
             if not confirm:
                 return
 
+        # Only plain SELECTs may be served from cache; anything else can change
+        # what cached results would show
+        read_only = QueryValidator.is_read_only(query)
+        if not read_only:
+            self.result_cache.clear()
+
         # Store current query details for logging
         self.current_query = {
             'query': query,
+            # Identifies re-runs of the same query regardless of formatting
+            'fingerprint': fingerprint(query).hex(),
             'databases': selected_databases,
-            'start_time': datetime.now(),
+            # Raw clocks only; the wall time is formatted when a log is written
+            'start_ns': time.monotonic_ns(),
+            'start_wall': time.time(),
             'results': []
         }
 
@@ -182,28 +217,26 @@ class SQLToolApp:
         self.main_ui.clear_results()
         self.main_ui.show_status("Executing query...")
         
-        # Start execution thread
-        threading.Thread(
-            target=self._execute_query_thread, 
-            args=(selected_databases, query), 
-            daemon=True
-        ).start()
-
-    def _execute_query_thread(self, databases, query):
+        # Run execution on the worker pool
+        self.executor.submit(self._execute_query_thread, selected_databases, query, read_only)
+
+    def _execute_query_thread(self, databases, query, read_only=False):
         """Execute query in separate thread"""
         try:
-            result = self.query_executor.execute_query(databases, query)
+            result = self.query_executor.execute_query(
+                databases, query, use_cache=read_only, read_only=read_only
+            )
             self.current_query.update(result)
-            self.message_queue.put(("done", "Query execution completed"))
-            self.message_queue.put(("enable_log_button", True))
+            self.post_message("done", "Query execution completed")
+            self.post_message("enable_log_button", True)
         except Exception as e:
-            self.message_queue.put(("error", f"Query execution failed: {str(e)}"))
-            self.message_queue.put(("done", "Query execution failed"))
+            self.post_message("error", f"Query execution failed: {str(e)}")
+            self.post_message("done", "Query execution failed")
 
     # File operations
     def save_query_log(self):
         """Save the current query and results to a log file"""
-        if not hasattr(self, 'current_query') or not self.current_query.get('results'):
+        if not self.current_query or not self.current_query.get('results'):
             messagebox.showwarning("No Results", "No query results to save")
             return
         
@@ -217,40 +250,40 @@ class SQLToolApp:
     def show_query_history(self):
         """Show query history dialog"""
         from app.ui.dialogs.history_dialog import HistoryDialog
-        history_dialog = HistoryDialog(self.root, self)
+        history_dialog = HistoryDialog(self.root, self, self.theme)
         history_dialog.show_history()
 
     def load_query_from_history(self, query):
         """Load query from history into editor"""
         self.main_ui.set_query_text(query)
 
-    # Queue message handling
-    def check_queue(self):
-        """Check the message queue for updates"""
+    # Message handling
+    def post_message(self, msg_type, msg):
+        """Hand a message to the Tk event loop; safe to call from worker threads"""
         try:
-            while True:
-                msg_type, msg = self.message_queue.get_nowait()
-
-                if msg_type == "enable_log_button":
-                    self.main_ui.enable_save_log_button()
-                elif msg_type == "success":
-                    self.handle_success_message(msg)
-                elif msg_type == "error":
-                    self.handle_error_message(msg)
-                elif msg_type == "execution_summary":
-                    self.main_ui.show_execution_summary(msg)
-                elif msg_type == "result":
-                    self.main_ui.append_result(msg)
-                elif msg_type == "status":
-                    self.main_ui.show_status(msg)
-                elif msg_type == "done":
-                    self.query_running = False
-                    self.main_ui.set_query_running_state(False)
-
-        except Empty:
+            self.root.after(0, self._dispatch, msg_type, msg)
+        except (RuntimeError, tk.TclError):
+            # Main loop is gone (application closing)
             pass
-        finally:
-            self.root.after(100, self.check_queue)
+
+    def _dispatch(self, msg_type, msg):
+        """Apply a message to the UI on the Tk thread"""
+        if msg_type == "result":
+            # The viewer batches bursts of writes into a single insert itself
+            self.main_ui.append_result(msg)
+        elif msg_type == "enable_log_button":
+            self.main_ui.enable_save_log_button()
+        elif msg_type == "success":
+            self.handle_success_message(msg)
+        elif msg_type == "error":
+            self.handle_error_message(msg)
+        elif msg_type == "execution_summary":
+            self.main_ui.show_execution_summary(msg)
+        elif msg_type == "status":
+            self.main_ui.show_status(msg)
+        elif msg_type == "done":
+            self.query_running = False
+            self.main_ui.set_query_running_state(False)
 
     def handle_success_message(self, msg):
         """Handle successful connection message"""
@@ -268,7 +301,8 @@ class SQLToolApp:
     def _switch_to_main_ui(self):
         """Switch from connection UI to main UI with maximized window (not fullscreen)"""
         try:
-            databases = self.db_manager.get_databases()
+            future, self._databases_future = self._databases_future, None
+            databases = future.result() if future else self.db_manager.get_databases()
             self.connection_ui.hide()
 
             # Set main window to maximized, not fullscreen
@@ -289,18 +323,29 @@ class SQLToolApp:
     # Application lifecycle
     def on_close(self):
         """Handle application close event"""
-        self.history_manager.save_history()
+        self.history_manager.close()
         if self.conn:
-            try:
+            with contextlib.suppress(pyodbc.Error):
                 self.conn.close()
-            except:
-                pass
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.statement_executor.shutdown(wait=False, cancel_futures=True)
+        self.db_manager.close_all()
         self.root.destroy()
 
     # Utility methods for UI components
     def get_current_server_info(self):
-        """Get current server information for display"""
-        return self.connection_details
+        """Read-only server and username of the current connection, or None"""
+        return self._server_info
+
+    def _invalidate_server_info(self):
+        """Replace the cached display info after connection_details changed"""
+        details = self.connection_details
+        # Replaced, never mutated, so callers may hold on to it
+        self._server_info = MappingProxyType({
+            'server': details['server'],
+            'username': details['username']
+        }) if details else None
+        self.connection_epoch += 1
 
     def get_query_history(self):
         """Get query history for history dialog"""
@@ -4,6 +4,8 @@ Contains all constants, colors, fonts, and settings for the SQL Tool application
 """
 
 import os
+from dataclasses import dataclass
+from typing import Final
 
 class AppConfig:
     """Main application configuration class"""
@@ -14,7 +16,7 @@ class AppConfig:
     
     APP_TITLE = "Zanvar's SQL Tool"
     APP_GEOMETRY = "1200x900"
-    HISTORY_FILE = "query_history.pkl"
+    HISTORY_FILE = "query_history.jsonl"
     MAX_HISTORY_ENTRIES = 50
     ASSETS_DIR = "assets"
     LOGO_FILENAME = "logo.png"
@@ -27,6 +29,7 @@ class AppConfig:
     DEFAULT_USERNAME = "sa"
     DEFAULT_PASSWORD = ""
     CONNECTION_TIMEOUT = 10
+    MAX_POOL_SIZE = 8  # idle connections kept per database
     QUERY_BATCH_SIZE = 1000
     
     # =============================================================================
@@ -94,6 +97,7 @@ class AppConfig:
         'database': ('Segoe UI', 12, 'bold'),
         'subtitle': ('Segoe UI', 14, 'bold'),
         'small': ('Segoe UI', 10),
+        'status_bold': ('Segoe UI', 10, 'bold'),
         
         # Special fonts
         'logo_title': ('Segoe UI', 18, 'bold'),
@@ -121,6 +125,7 @@ class AppConfig:
         # Component sizes
         'query_editor_height': 20,
         'result_viewer_height': 10,
+        'result_viewer_max_lines': 5000,  # oldest output is trimmed beyond this; 0 keeps everything
         'logo_size': (240, 120),
         'logo_fallback_size': (80, 40),
         
@@ -161,6 +166,11 @@ class AppConfig:
         # Execution settings
         'fetch_batch_size': 1000,
         'max_column_width': 50,
+        'max_display_rows': 1000,  # rows rendered per result set; counts stay exact
+        # 'per_statement' commits after every statement; 'per_batch' commits once
+        # per database and isolates failing statements with savepoints. Scripts
+        # with CREATE/ALTER DATABASE, BACKUP or RESTORE need 'per_statement'.
+        'commit_mode': 'per_statement',
     }
     
     # =============================================================================
@@ -176,6 +186,10 @@ class AppConfig:
             ("Text Files", "*.txt"), 
             ("All Files", "*.*")
         ],
+        # Query logs are streamed through this buffer, result by result
+        'log_buffer_size': 1 << 18,
+        # fsync saved logs before reporting success (slower, survives power loss)
+        'log_fsync': False,
         
         # Assets
         'logo_path': os.path.join("assets", "logo.png"),
@@ -251,14 +265,25 @@ class AppConfig:
         'max_filename_hash_length': 8,
     }
     
+    # =============================================================================
+    # CACHE SETTINGS
+    # =============================================================================
+    
+    CACHE = {
+        'databases_ttl': 60,  # seconds
+        'result_ttl': 30,  # seconds
+        'result_max_entries': 256,
+    }
+    
     # =============================================================================
     # THREADING SETTINGS
     # =============================================================================
     
     THREADING = {
-        'queue_check_interval': 100,  # milliseconds
         'daemon_threads': True,
         'connection_switch_delay': 1000,  # milliseconds
+        'max_db_workers': 8,  # databases queried concurrently per execution
+        'max_statement_workers': 4,  # independent SELECTs run in parallel per database
     }
     
     # =============================================================================
@@ -320,6 +345,67 @@ class AppConfig:
             'selectforeground': cls.COLORS['console_select_fg']
         }
 
+# =============================================================================
+# THEME CONSTANTS
+# =============================================================================
+# Bound once at import so the UI reads plain names instead of dict lookups
+
+BG_COLOR: Final = AppConfig.COLORS['bg_color']
+PRIMARY_COLOR: Final = AppConfig.COLORS['primary_color']
+MUTED_COLOR: Final = AppConfig.COLORS['muted_color']
+SUCCESS_COLOR: Final = AppConfig.COLORS['success_color']
+ACCENT_COLOR: Final = AppConfig.COLORS['accent_color']
+BORDER_COLOR: Final = AppConfig.COLORS['border_color']
+CARD_BG: Final = AppConfig.COLORS['card_bg']
+LIGHT_GRAY: Final = AppConfig.COLORS['light_gray']
+DARK_BG: Final = AppConfig.COLORS['dark_bg']
+ERROR_COLOR: Final = AppConfig.COLORS['error_color']
+WARNING_COLOR: Final = AppConfig.COLORS['warning_color']
+
+FONT_NORMAL: Final = AppConfig.FONTS['normal']
+FONT_BOLD: Final = AppConfig.FONTS['bold']
+FONT_LABEL: Final = AppConfig.FONTS['label']
+FONT_HEADER: Final = AppConfig.FONTS['header']
+FONT_DATABASE: Final = AppConfig.FONTS['database']
+FONT_SUBTITLE: Final = AppConfig.FONTS['subtitle']
+FONT_SMALL: Final = AppConfig.FONTS['small']
+
+@dataclass(frozen=True)
+class Theme:
+    """Immutable color/font bundle shared by all UI components"""
+    __slots__ = (
+        "bg_color", "primary_color", "muted_color", "success_color", "accent_color",
+        "border_color", "card_bg", "light_gray", "dark_bg", "error_color", "warning_color",
+        "font_normal", "font_bold", "font_label", "font_header", "font_database",
+        "font_subtitle", "font_small",
+    )
+
+    bg_color: str
+    primary_color: str
+    muted_color: str
+    success_color: str
+    accent_color: str
+    border_color: str
+    card_bg: str
+    light_gray: str
+    dark_bg: str
+    error_color: str
+    warning_color: str
+    font_normal: tuple
+    font_bold: tuple
+    font_label: tuple
+    font_header: tuple
+    font_database: tuple
+    font_subtitle: tuple
+    font_small: tuple
+
+THEME: Final = Theme(
+    BG_COLOR, PRIMARY_COLOR, MUTED_COLOR, SUCCESS_COLOR, ACCENT_COLOR,
+    BORDER_COLOR, CARD_BG, LIGHT_GRAY, DARK_BG, ERROR_COLOR, WARNING_COLOR,
+    FONT_NORMAL, FONT_BOLD, FONT_LABEL, FONT_HEADER, FONT_DATABASE,
+    FONT_SUBTITLE, FONT_SMALL,
+)
+
 # =============================================================================
 # ENVIRONMENT-SPECIFIC SETTINGS
 # =============================================================================
@@ -1,36 +1,185 @@
+import threading
+import time
 import pyodbc
 from contextlib import contextmanager
+from queue import LifoQueue, Empty, Full
+
+from app.core.config import AppConfig
+
+# Let the ODBC driver manager keep its own pool as well
+pyodbc.pooling = True
 
 class DatabaseManager:
+    __slots__ = ("current_server", "conn", "_conn_str_tmpl", "_pool", "_pool_lock", "_databases_cache")
+
+    POOL_SIZE = AppConfig.MAX_POOL_SIZE
+    FETCH_BATCH_SIZE = 256
+    # Newest first; the legacy driver is used only when none of these is installed
+    PREFERRED_DRIVERS = ("ODBC Driver 18 for SQL Server", "ODBC Driver 17 for SQL Server")
+    LEGACY_DRIVER = "SQL Server"
+
     def __init__(self):
         self.current_server = None
         self.conn = None
+        # Connection string with a %s placeholder for the database name
+        self._conn_str_tmpl = None
+        # Idle connections per database, reused across queries; LIFO hands out
+        # the most recently used (warmest) connection first
+        self._pool = {}
+        # Guards creating and dropping the per-database queues, which worker threads share
+        self._pool_lock = threading.Lock()
+        # (server, username, password) -> (expiry, database names); per instance so
+        # a wrong password never sees another login's list
+        self._databases_cache = {}
 
     @contextmanager
-    def database_connection(self, database="master"):
-        """Context manager for database connections"""
+    def database_connection(self, database="master", autocommit=False):
+        """Context manager that checks a connection out of the pool
+
+        autocommit skips the implicit transaction; only use it for read-only work.
+        """
         if not self.current_server:
             raise ValueError("No server configuration available")
-            
-        conn = None
+
+        pool = self._get_pool(database)
+        try:
+            conn = pool.get_nowait()
+        except Empty:
+            conn = self._configure(pyodbc.connect(self._conn_str_tmpl % self._odbc_value(database), timeout=10))
+        if conn.autocommit != autocommit:
+            conn.autocommit = autocommit
+
         try:
-            conn = pyodbc.connect(
-                f'DRIVER={{SQL Server}};SERVER={self.current_server["server"]};'
-                f'DATABASE={database};UID={self.current_server["username"]};'
-                f'PWD={self.current_server["password"]}',
-                timeout=10
-            )
             yield conn
-        finally:
-            if conn:
-                conn.close()
+        except pyodbc.Error as e:
+            if self._is_connection_error(e):
+                # The link is broken - drop it and any idle siblings
+                self._discard(conn)
+                self.invalidate(database)
+            else:
+                # A failed statement; the connection itself is still good
+                self._release(database, pool, conn)
+            raise
+        except BaseException:
+            self._release(database, pool, conn)
+            raise
+        else:
+            self._release(database, pool, conn)
+
+    def _get_pool(self, database):
+        """Idle-connection queue for a database, created on first use"""
+        with self._pool_lock:
+            pool = self._pool.get(database)
+            if pool is None:
+                pool = self._pool[database] = LifoQueue(maxsize=self.POOL_SIZE)
+            return pool
+
+    @staticmethod
+    def _is_connection_error(error):
+        """True when the error means the connection is unusable, not just the statement"""
+        if isinstance(error, (pyodbc.OperationalError, pyodbc.InterfaceError)):
+            return True
+        # SQLSTATE class 08: connection exception
+        return bool(error.args) and str(error.args[0]).startswith("08")
+
+    @staticmethod
+    def _configure(conn):
+        """Decode/encode wide text natively instead of through pyodbc's fallbacks"""
+        conn.setdecoding(pyodbc.SQL_WCHAR, encoding='utf-16le')
+        conn.setencoding(encoding='utf-16le')
+        return conn
+
+    def _release(self, database, pool, conn):
+        """Return a connection to its pool, closing it if it can't be reused"""
+        try:
+            conn.rollback()
+            # The pool may have been dropped by close_all/invalidate (e.g. a new
+            # login) while the connection was out; don't park it where nobody looks
+            with self._pool_lock:
+                if self._pool.get(database) is pool:
+                    pool.put_nowait(conn)
+                    return
+        except (pyodbc.Error, Full):
+            pass
+        self._discard(conn)
+
+    @staticmethod
+    def _discard(conn):
+        """Close a connection, ignoring errors from an already dead link"""
+        try:
+            conn.close()
+        except pyodbc.Error:
+            pass
+
+    def invalidate(self, database):
+        """Close all idle pooled connections for a database"""
+        with self._pool_lock:
+            pool = self._pool.pop(database, None)
+        if pool is None:
+            return
+        while True:
+            try:
+                self._discard(pool.get_nowait())
+            except Empty:
+                break
+
+    def close_all(self):
+        """Close every pooled connection"""
+        with self._pool_lock:
+            databases = list(self._pool)
+        for database in databases:
+            self.invalidate(database)
 
     def set_server_config(self, server, username, password):
+        # Pooled connections belong to the previous server/credentials
+        self.close_all()
         self.current_server = {
             'server': server,
             'username': username,
             'password': password
         }
+        self._conn_str_tmpl = self._build_conn_str_template(server, username, password)
+
+    def clear_server_config(self):
+        """Forget the current server and close its pooled connections"""
+        self.close_all()
+        self.current_server = None
+        self._conn_str_tmpl = None
+
+    @classmethod
+    def _pick_driver(cls):
+        """Return the newest installed SQL Server ODBC driver"""
+        installed = set(pyodbc.drivers())
+        for driver in cls.PREFERRED_DRIVERS:
+            if driver in installed:
+                return driver
+        return cls.LEGACY_DRIVER
+
+    @classmethod
+    def _build_conn_str_template(cls, server, username, password):
+        """Build the connection string once per server config"""
+        driver = cls._pick_driver()
+        parts = [
+            f"DRIVER={{{driver}}}",
+            f"SERVER={cls._odbc_value(server)}",
+            "DATABASE=%s",
+            f"UID={cls._odbc_value(username)}",
+            f"PWD={cls._odbc_value(password)}",
+        ]
+        if driver != cls.LEGACY_DRIVER:
+            parts.append("MARS_Connection=Yes")
+        if driver == "ODBC Driver 18 for SQL Server":
+            # Driver 18 encrypts by default; keep the legacy driver's behaviour
+            parts.append("Encrypt=Optional")
+        # Escape literal % so only the DATABASE placeholder is substituted
+        return ";".join(p if p == "DATABASE=%s" else p.replace("%", "%%") for p in parts)
+
+    @staticmethod
+    def _odbc_value(value):
+        """Brace-quote a connection string value when it contains special characters"""
+        if any(ch in value for ch in ";{}="):
+            return "{" + value.replace("}", "}}") + "}"
+        return value
 
     def test_connection(self):
         """Test database connection"""
@@ -44,11 +193,34 @@ class DatabaseManager:
             return False, str(e)
 
     def get_databases(self):
-        """Get list of available databases"""
+        """Get list of available databases (cached for a short TTL)"""
+        if not self.current_server:
+            raise ValueError("No server configuration available")
+        server = self.current_server
+        key = (server['server'], server['username'], server['password'])
+        now = time.monotonic()
+        cached = self._databases_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return list(cached[1])
         try:
-            with self.database_connection("master") as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT name FROM sys.databases WHERE database_id > 4 AND state = 0 ORDER BY name")
-                return [db[0] for db in cursor.fetchall()]
+            names = self._fetch_databases()
         except Exception as e:
             raise Exception(f"Failed to fetch databases: {e}")
+        # Drop expired lists so old logins don't accumulate
+        self._databases_cache = {k: v for k, v in self._databases_cache.items() if v[0] > now}
+        self._databases_cache[key] = (now + AppConfig.CACHE['databases_ttl'], names)
+        return list(names)
+
+    def _fetch_databases(self):
+        """Fetch the names of the user databases that are online"""
+        with self.database_connection("master") as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = self.FETCH_BATCH_SIZE
+            cursor.execute("SELECT name FROM sys.databases WHERE database_id > 4 AND state = 0 ORDER BY name")
+            # Stream rows in batches instead of materializing the full row list first
+            batches = iter(lambda: cursor.fetchmany(self.FETCH_BATCH_SIZE), [])
+            return tuple(row[0] for batch in batches for row in batch)
+
+    def clear_cache(self):
+        """Forget cached database lists"""
+        self._databases_cache = {}
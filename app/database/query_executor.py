@@ -1,15 +1,317 @@
+import functools
+import io
 import time
 import pyodbc
 import re
+from collections import deque, namedtuple
 from datetime import datetime
+from decimal import Decimal
+
+from app.utils.result_cache import fingerprint
+from app.utils.validators import QueryValidator
+
+# Statement splitter patterns, compiled once at import
+_GO_RE = re.compile(r'^\s*GO\s*$', re.MULTILINE | re.IGNORECASE)
+_IF_DROP_PROC_RE = re.compile(
+    r'(IF\s+OBJECT_ID\s*\([^)]+\)\s+IS\s+NOT\s+NULL\s+DROP\s+PROCEDURE\s+[^;]+;)',
+    re.DOTALL | re.IGNORECASE
+)
+_CREATE_PROC_RE = re.compile(r'(CREATE\s+PROCEDURE\s+.*)', re.DOTALL | re.IGNORECASE)
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_COMPLEX_RES = tuple(re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    # CREATE/ALTER/DROP procedures
+    r'\b(CREATE|ALTER|DROP)\s+(PROCEDURE|PROC)\s+',
+    # CREATE/ALTER/DROP functions
+    r'\b(CREATE|ALTER|DROP)\s+(FUNCTION|FUNC)\s+',
+    # CREATE/ALTER/DROP triggers
+    r'\b(CREATE|ALTER|DROP)\s+TRIGGER\s+',
+    # CREATE/ALTER/DROP views with complex definitions
+    r'\b(CREATE|ALTER|DROP)\s+VIEW\s+.*?\bAS\b.*?\bSELECT\b',
+    # Stored procedure execution
+    r'\b(EXEC|EXECUTE)\s+\w+',
+    # DECLARE blocks (variable declarations)
+    r'\bDECLARE\s+@\w+',
+    # Complex BEGIN...END blocks
+    r'\bBEGIN\b.*?\bEND\b',
+))
+_ROUTINE_DDL_RE = re.compile(r'\b(CREATE|ALTER|DROP)\s+(PROCEDURE|PROC|FUNCTION|FUNC|TRIGGER)\s+', re.IGNORECASE)
+_EXEC_RE = re.compile(r'\b(EXEC|EXECUTE)\s+\w+', re.IGNORECASE)
+# A query can only be kept whole by the complex-pattern check when it
+# contains one of these; anything else skips the regex scans
+_COMPLEX_KEYWORDS = ('PROC', 'FUNC', 'TRIGGER', 'EXEC')
+_CREATE_ALTER_PROC_RE = re.compile(r'\b(CREATE|ALTER)\s+(PROCEDURE|PROC)\s+', re.IGNORECASE)
+# Tokens that matter for statement boundaries; unterminated strings and
+# identifiers run to the end of the query. Each structural token has its own
+# group so the scanner dispatches on lastgroup without case-folding the text
+_SPLIT_TOKEN_RE = re.compile(
+    r"'(?:[^']|'')*(?:'|\Z)"
+    r'|"(?:[^"]|"")*(?:"|\Z)'
+    r"|\[[^\]]*(?:\]|\Z)"
+    r"|--[^\n]*|/\*.*?\*/"
+    r"|\b(?P<begin>BEGIN)\b|\b(?P<end>END)\b"
+    r"|(?P<open>\()|(?P<close>\))|(?P<semi>;)",
+    re.IGNORECASE | re.DOTALL
+)
+
+def _parse_sql_statements(query):
+    """Split SQL query into individual statements - ENHANCED VERSION FOR PROCEDURE OPERATIONS"""
+    # Clean up the query
+    query = query.strip()
+    if not query:
+        return []
+
+    # First, check for GO statements (SQL Server batch separators)
+    # GO statements should split the query into separate batches
+    if _GO_RE.search(query):
+        # Split by GO statements first
+        batches = _GO_RE.split(query)
+
+        statements = []
+        for batch in batches:
+            batch = batch.strip()
+            if batch:
+                # Each batch is treated as a single statement
+                statements.append(batch)
+
+        return [stmt for stmt in statements if stmt and stmt.strip()]
+
+    # Check for DROP + CREATE procedure pattern (without GO)
+    # This handles the specific case of DROP PROCEDURE followed by CREATE PROCEDURE
+    # More robust pattern matching
+
+    # Look for IF OBJECT_ID...DROP PROCEDURE pattern
+    if_drop_match = _IF_DROP_PROC_RE.search(query)
+
+    # Look for CREATE PROCEDURE pattern  
+    create_match = _CREATE_PROC_RE.search(query)
+
+    # If we found both patterns, split them
+    if if_drop_match and create_match:
+        drop_part = if_drop_match.group(1).strip()
+
+        # Get everything after the DROP statement as the CREATE part
+        drop_end = if_drop_match.end()
+        create_part = query[drop_end:].strip()
+
+        # Clean up the CREATE part (remove leading comments/whitespace)
+        create_lines = create_part.split('\n')
+        cleaned_create_lines = []
+        found_create = False
+
+        for line in create_lines:
+            line_stripped = line.strip()
+            if line_stripped.startswith('--'):
+                if found_create:
+                    break  # Stop at first comment after CREATE
+                continue  # Skip comments before CREATE
+            if line_stripped.upper().startswith('CREATE'):
+                found_create = True
+            if found_create or line_stripped:
+                cleaned_create_lines.append(line)
+
+        if cleaned_create_lines:
+            create_part = '\n'.join(cleaned_create_lines).strip()
+            return [drop_part, create_part]
+
+    # Remove single-line comments but preserve the structure
+    lines = query.split('\n')
+    cleaned_lines = []
+    for line in lines:
+        # Remove comments but keep the line structure
+        if '--' in line:
+            comment_pos = line.find('--')
+            line = line[:comment_pos].rstrip()
+        cleaned_lines.append(line)
+    query = '\n'.join(cleaned_lines)
+
+    # Remove multi-line comments
+    query = _BLOCK_COMMENT_RE.sub('', query)
+    query = query.strip()
+
+    # Check if this is a complex statement that shouldn't be split
+    upper = query.upper()
+    if any(keyword in upper for keyword in _COMPLEX_KEYWORDS):
+        for pattern in _COMPLEX_RES:
+            if pattern.search(query):
+                # For CREATE PROCEDURE and similar complex statements, return as single statement
+                if _ROUTINE_DDL_RE.search(query):
+                    return [query]
+                # For EXEC statements, also return as single statement
+                elif _EXEC_RE.search(query):
+                    return [query]
+
+    # For regular SQL, use intelligent splitting: only strings, bracketed
+    # identifiers, parentheses, BEGIN/END and semicolons are visited
+    statements = []
+    stmt_start = 0
+    paren_depth = 0
+    begin_end_depth = 0
+
+    for token in _SPLIT_TOKEN_RE.finditer(query):
+        kind = token.lastgroup
+        if kind == 'begin':
+            begin_end_depth += 1
+        elif kind == 'end':
+            begin_end_depth = max(0, begin_end_depth - 1)
+        elif kind == 'open':
+            paren_depth += 1
+        elif kind == 'close':
+            paren_depth -= 1
+        elif kind == 'semi' and paren_depth == 0 and begin_end_depth == 0:
+            # This is a true statement separator
+            statement = query[stmt_start:token.start()].strip()
+            if statement:
+                statements.append(statement)
+            stmt_start = token.end()
+
+    # Add the last statement
+    statement = query[stmt_start:].strip()
+    if statement:
+        statements.append(statement)
+
+    # If we only got one statement and it contains CREATE PROCEDURE, return it as-is
+    if len(statements) == 1 and _CREATE_ALTER_PROC_RE.search(statements[0]):
+        return statements
+
+    # Filter out empty statements
+    return [stmt for stmt in statements if stmt and stmt.strip()]
+
+@functools.lru_cache(maxsize=256)
+def _split_sql_statements_cached(query):
+    """Memoized statement split; scripts are re-run against many databases"""
+    return tuple(_parse_sql_statements(query))
+
+# Temp tables and variables tie statements to one session
+_SESSION_STATE_RE = re.compile(r'[#@]')
+
+def _independent_selects(statements):
+    """True when the script is several plain SELECTs sharing no session state"""
+    return len(statements) > 1 and all(
+        isinstance(statement, str)
+        and QueryValidator.is_read_only(statement)
+        and not _SESSION_STATE_RE.search(statement)
+        for statement in statements
+    )
+
+# Rulers framing formatted results and the execution summary
+_RULE_80 = "═" * 80
+_RULE_100 = "═" * 100
+_ASCII_RULE_100 = "=" * 100
+
+# Single-row INSERT whose VALUES list holds nothing but plain literals
+_INSERT_VALUES_RE = re.compile(
+    r'INSERT\s+INTO\s+(\S+)\s*\(([^)]+)\)\s*VALUES\s*\((.+)\)\s*;?',
+    re.IGNORECASE | re.DOTALL
+)
+_LITERAL_RE = re.compile(
+    r"\s*(?:N?'(?P<str>(?:[^']|'')*)'|(?P<int>[-+]?\d{1,18})|(?P<dec>[-+]?\d*\.\d+|[-+]?\d+\.)|(?P<null>NULL))\s*(?:,|\Z)",
+    re.IGNORECASE
+)
+
+# Consecutive literal INSERTs into the same table/columns, run as one executemany
+InsertBatch = namedtuple('InsertBatch', ['sql', 'rows', 'statements'])
+
+def _parse_insert(statement):
+    """Return ((table, columns), params) for a literal single-row INSERT, else None"""
+    match = _INSERT_VALUES_RE.fullmatch(statement)
+    if not match:
+        return None
+    table, columns, values = match.groups()
+    columns = tuple(c.strip() for c in columns.split(','))
+    params = []
+    pos = 0
+    while pos < len(values):
+        literal = _LITERAL_RE.match(values, pos)
+        if not literal:
+            return None
+        kind = literal.lastgroup
+        if kind == 'str':
+            params.append(literal.group('str').replace("''", "'"))
+        elif kind == 'int':
+            params.append(int(literal.group('int')))
+        elif kind == 'dec':
+            params.append(Decimal(literal.group('dec')))
+        else:
+            params.append(None)
+        pos = literal.end()
+    if len(params) != len(columns):
+        return None
+    return (table, columns), tuple(params)
+
+@functools.lru_cache(maxsize=64)
+def _batch_inserts(statements):
+    """Collapse runs of literal INSERTs into InsertBatch items; other statements pass through
+
+    A run only continues while the table, column list and parameter types
+    match, so every row binds the same way.
+    """
+    planned = []
+    run = []
+    run_target = run_key = None
+
+    def flush():
+        if len(run) > 1:
+            table, columns = run_target
+            sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+            planned.append(InsertBatch(
+                sql, tuple(params for _, params in run), tuple(statement for statement, _ in run)
+            ))
+        else:
+            planned.extend(statement for statement, _ in run)
+        run.clear()
+
+    for statement in statements:
+        parsed = _parse_insert(statement)
+        if parsed is None:
+            flush()
+            planned.append(statement)
+            continue
+        target, params = parsed
+        key = (target[0].lower(), tuple(c.lower() for c in target[1]), tuple(map(type, params)))
+        if key != run_key:
+            flush()
+            run_target, run_key = target, key
+        run.append((statement, params))
+    flush()
+    return tuple(planned)
 
 class QueryExecutor:
-        def __init__(self, db_manager, message_queue):
+        # Default batch size for fetchmany() on query cursors
+        FETCH_ARRAYSIZE = 10000
+        # Send runs of literal single-row INSERTs as one fast_executemany call. Off by
+        # default: literals are rebound as typed parameters, which can convert differently
+        BATCH_INSERTS = False
+        # Savepoint marking the start of each statement in per-batch commit mode
+        SAVEPOINT_NAME = "sqltool_stmt"
+
+        def __init__(self, db_manager, post, executor, result_cache=None, max_workers=4,
+                     stream_results=True, commit_mode="per_statement", max_display_rows=1000,
+                     statement_executor=None):
             self.db_manager = db_manager
-            self.message_queue = message_queue
+            # Thread-safe callable delivering (msg_type, msg) to the UI
+            self.post = post
+            self.executor = executor
+            self.result_cache = result_cache
+            # Upper bound on databases processed concurrently for one query
+            self.max_workers = max_workers
+            # Post each result as soon as it is formatted; when off, a database's
+            # results are sent together once it finishes
+            self.stream_results = stream_results
+            # "per_statement" or "per_batch" (one commit per database)
+            self.commit_mode = commit_mode
+            # Rows rendered per result set; the rest are only counted
+            self.max_display_rows = max_display_rows
+            # Separate pool for running independent SELECTs of one database in
+            # parallel; None keeps every database's statements serial
+            self.statement_executor = statement_executor
 
-        def execute_query(self, databases, query):
-            """Execute query against multiple databases"""
+        def execute_query(self, databases, query, use_cache=False, read_only=False):
+            """Execute query against multiple databases
+
+            With use_cache, results of read-only queries are served from and
+            stored in the result cache per database. read_only runs the
+            statements in autocommit mode, skipping the per-statement commit.
+            """
             # Fix: Ensure query is a string, not a list
             if isinstance(query, list):
                 query = ' '.join(query)
@@ -33,15 +335,64 @@ class QueryExecutor:
             if not statements:
                 raise ValueError("No valid SQL statements found")
             
+            if self.BATCH_INSERTS:
+                statements = _batch_inserts(tuple(statements))
+            
+            concurrent = (
+                read_only and self.statement_executor is not None
+                and _independent_selects(statements)
+            )
+            
+            use_cache = use_cache and self.result_cache is not None
+            server_key = self._server_key() if use_cache else None
+            query_key = fingerprint(query) if use_cache else None
+            
+            # Serve cached databases right away and queue up the rest
+            results_by_db = {}
+            pending = deque()
             for db in databases:
-                db_info = self._execute_on_database(db, statements)
+                cached = self.result_cache.get(server_key, db, query_key) if use_cache else None
+                if cached is not None:
+                    results_by_db[db] = dict(cached, status='Cached', exec_time=0.0)
+                    self._send_database_results(results_by_db[db])
+                else:
+                    pending.append(db)
+            
+            def drain_pending():
+                # Each worker keeps pulling databases until the queue is empty,
+                # each result reaching the UI as soon as it is formatted
+                while True:
+                    try:
+                        db = pending.popleft()
+                    except IndexError:
+                        return
+                    db_info = self._execute_on_database(
+                        db, statements, read_only, keep_results=use_cache, concurrent=concurrent
+                    )
+                    results_by_db[db] = db_info
+                    if not self.stream_results:
+                        self._send_database_results(db_info)
+                    if use_cache and not db_info['errors']:
+                        self.result_cache.put(server_key, db, query_key, db_info)
+            
+            workers = [
+                self.executor.submit(drain_pending)
+                for _ in range(min(len(pending), self.max_workers))
+            ]
+            # Join barrier: the summary is only built once every worker is done
+            for worker in workers:
+                worker.result()
+            
+            # Keep the summary in the order the databases were selected
+            for db in databases:
+                db_info = results_by_db[db]
                 databases_info.append(db_info)
                 overall_total_rows += db_info['total_rows']
             
             total_exec_time = time.time() - start_time
             
-            # Generate and send results
-            self._send_results(databases_info, total_exec_time, overall_total_rows)
+            # Generate and send the summary
+            self._send_summary(databases_info, total_exec_time, overall_total_rows)
             
             return {
                 'exec_time': total_exec_time,
@@ -49,261 +400,123 @@ class QueryExecutor:
                 'databases_info': databases_info
             }
 
+        def _server_key(self):
+            """Identify the current server/login for cache keys"""
+            server = self.db_manager.current_server
+            return f"{server['server']}|{server['username']}"
+
         def _split_sql_statements(self, query):
-            """Split SQL query into individual statements - ENHANCED VERSION FOR PROCEDURE OPERATIONS"""
-            # Clean up the query
-            query = query.strip()
-            if not query:
-                return []
-            
-            # First, check for GO statements (SQL Server batch separators)
-            # GO statements should split the query into separate batches
-            if re.search(r'^\s*GO\s*$', query, re.MULTILINE | re.IGNORECASE):
-                # Split by GO statements first
-                batches = re.split(r'^\s*GO\s*$', query, flags=re.MULTILINE | re.IGNORECASE)
-                
-                statements = []
-                for batch in batches:
-                    batch = batch.strip()
-                    if batch:
-                        # Each batch is treated as a single statement
-                        statements.append(batch)
-                
-                return [stmt for stmt in statements if stmt and stmt.strip()]
-            
-            # Check for DROP + CREATE procedure pattern (without GO)
-            # This handles the specific case of DROP PROCEDURE followed by CREATE PROCEDURE
-            # More robust pattern matching
-            
-            # Look for IF OBJECT_ID...DROP PROCEDURE pattern
-            if_drop_match = re.search(
-                r'(IF\s+OBJECT_ID\s*\([^)]+\)\s+IS\s+NOT\s+NULL\s+DROP\s+PROCEDURE\s+[^;]+;)',
-                query,
-                re.DOTALL | re.IGNORECASE
-            )
-            
-            # Look for CREATE PROCEDURE pattern  
-            create_match = re.search(
-                r'(CREATE\s+PROCEDURE\s+.*)',
-                query,
-                re.DOTALL | re.IGNORECASE
-            )
-            
-            # If we found both patterns, split them
-            if if_drop_match and create_match:
-                drop_part = if_drop_match.group(1).strip()
-                
-                # Get everything after the DROP statement as the CREATE part
-                drop_end = if_drop_match.end()
-                create_part = query[drop_end:].strip()
-                
-                # Clean up the CREATE part (remove leading comments/whitespace)
-                create_lines = create_part.split('\n')
-                cleaned_create_lines = []
-                found_create = False
-                
-                for line in create_lines:
-                    line_stripped = line.strip()
-                    if line_stripped.startswith('--'):
-                        if found_create:
-                            break  # Stop at first comment after CREATE
-                        continue  # Skip comments before CREATE
-                    if line_stripped.upper().startswith('CREATE'):
-                        found_create = True
-                    if found_create or line_stripped:
-                        cleaned_create_lines.append(line)
-                
-                if cleaned_create_lines:
-                    create_part = '\n'.join(cleaned_create_lines).strip()
-                    return [drop_part, create_part]
-            
-            # Remove single-line comments but preserve the structure
-            lines = query.split('\n')
-            cleaned_lines = []
-            for line in lines:
-                # Remove comments but keep the line structure
-                if '--' in line:
-                    comment_pos = line.find('--')
-                    line = line[:comment_pos].rstrip()
-                cleaned_lines.append(line)
-            query = '\n'.join(cleaned_lines)
-            
-            # Remove multi-line comments
-            query = re.sub(r'/\*.*?\*/', '', query, flags=re.DOTALL)
-            query = query.strip()
-            
-            # Check for complex statements that should NOT be split
-            complex_patterns = [
-                # CREATE/ALTER/DROP procedures
-                r'\b(CREATE|ALTER|DROP)\s+(PROCEDURE|PROC)\s+',
-                # CREATE/ALTER/DROP functions  
-                r'\b(CREATE|ALTER|DROP)\s+(FUNCTION|FUNC)\s+',
-                # CREATE/ALTER/DROP triggers
-                r'\b(CREATE|ALTER|DROP)\s+TRIGGER\s+',
-                # CREATE/ALTER/DROP views with complex definitions
-                r'\b(CREATE|ALTER|DROP)\s+VIEW\s+.*?\bAS\b.*?\bSELECT\b',
-                # Stored procedure execution
-                r'\b(EXEC|EXECUTE)\s+\w+',
-                # DECLARE blocks (variable declarations)
-                r'\bDECLARE\s+@\w+',
-                # Complex BEGIN...END blocks
-                r'\bBEGIN\b.*?\bEND\b'
-            ]
-            
-            # Check if this is a complex statement that shouldn't be split
-            for pattern in complex_patterns:
-                if re.search(pattern, query, re.IGNORECASE | re.DOTALL):
-                    # For CREATE PROCEDURE and similar complex statements, return as single statement
-                    if re.search(r'\b(CREATE|ALTER|DROP)\s+(PROCEDURE|PROC|FUNCTION|FUNC|TRIGGER)\s+', query, re.IGNORECASE):
-                        return [query]
-                    # For EXEC statements, also return as single statement
-                    elif re.search(r'\b(EXEC|EXECUTE)\s+\w+', query, re.IGNORECASE):
-                        return [query]
-            
-            # For regular SQL, use intelligent splitting
-            statements = []
-            current_statement = ""
-            in_string = False
-            string_char = None
-            in_bracket = False
-            bracket_depth = 0
-            paren_depth = 0
-            begin_end_depth = 0
-            
-            i = 0
-            while i < len(query):
-                char = query[i]
-                
-                # Handle string literals
-                if char in ("'", '"') and not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char and in_string:
-                    # Check for escaped quotes
-                    if i + 1 < len(query) and query[i + 1] == string_char:
-                        current_statement += char + char
-                        i += 1
-                    else:
-                        in_string = False
-                        string_char = None
-                
-                # Handle square brackets (for identifiers)
-                elif char == '[' and not in_string:
-                    in_bracket = True
-                elif char == ']' and in_bracket and not in_string:
-                    in_bracket = False
-                
-                # Track depths outside of strings and brackets
-                elif not in_string and not in_bracket:
-                    if char == '(':
-                        paren_depth += 1
-                    elif char == ')':
-                        paren_depth -= 1
-                    elif query[i:i+5].upper() == 'BEGIN':
-                        # Make sure it's a word boundary
-                        if (i == 0 or not query[i-1].isalnum()) and (i+5 >= len(query) or not query[i+5].isalnum()):
-                            begin_end_depth += 1
-                    elif query[i:i+3].upper() == 'END':
-                        # Make sure it's a word boundary  
-                        if (i == 0 or not query[i-1].isalnum()) and (i+3 >= len(query) or not query[i+3].isalnum()):
-                            begin_end_depth = max(0, begin_end_depth - 1)
-                    elif char == ';' and paren_depth == 0 and begin_end_depth == 0:
-                        # This is a true statement separator
-                        if current_statement.strip():
-                            statements.append(current_statement.strip())
-                        current_statement = ""
-                        i += 1
-                        continue
-                
-                current_statement += char
-                i += 1
-            
-            # Add the last statement
-            if current_statement.strip():
-                statements.append(current_statement.strip())
-            
-            # If we only got one statement and it contains CREATE PROCEDURE, return it as-is
-            if len(statements) == 1 and re.search(r'\b(CREATE|ALTER)\s+(PROCEDURE|PROC)\s+', statements[0], re.IGNORECASE):
-                return statements
-            
-            # Filter out empty statements
-            return [stmt for stmt in statements if stmt and stmt.strip()]
+            """Split SQL query into individual statements"""
+            return list(_split_sql_statements_cached(query))
 
-        def _execute_on_database(self, db, statements):
-            """Execute statements on a single database"""
+        def _execute_on_database(self, db, statements, read_only=False, keep_results=False,
+                                 concurrent=False):
+            """Execute statements on a single database
+
+            Formatted results are only kept in the returned info when
+            keep_results is set (for the result cache) or streaming is off.
+            With concurrent, statements run in parallel on separate connections.
+            """
             db_start_time = time.time()
             db_total_rows = 0
             db_errors = []
             db_statement_count = 0
             db_results = []
+            stream = self.stream_results
+            keep = keep_results or not stream
+
+            def emit(result):
+                if stream:
+                    self.post("result", result)
+                if keep:
+                    db_results.append(result)
             
             try:
-                self.message_queue.put(("status", f"🔄 Connecting to {db}..."))
+                self.post("status", f"🔄 Connecting to {db}...")
                 
-                with self.db_manager.database_connection(db) as conn:
-                    cursor = conn.cursor()
-                    total_statements = len(statements)
-                    
-                    for i, statement in enumerate(statements, 1):
+                if concurrent:
+                    # Independent SELECTs each run on their own pooled connection;
+                    # results are still reported in statement order
+                    outcomes = [
+                        self.statement_executor.submit(self._run_isolated_statement, db, statement, i)
+                        for i, statement in enumerate(statements, 1)
+                    ]
+                    for i, outcome in enumerate(outcomes, 1):
                         db_statement_count += 1
                         try:
-                            # For each statement, execute it completely
-                            cursor.execute(statement)
-                            
-                            # Handle multiple result sets (especially for stored procedures)
-                            result_sets = []
-                            
-                            while True:
-                                rows = []
-                                if cursor.description:
-                                    # Fetch rows in batches to avoid memory issues
-                                    while True:
-                                        batch = cursor.fetchmany(1000)
-                                        if not batch:
-                                            break
-                                        rows.extend(batch)
-                                    
-                                    if rows:
-                                        result_sets.append((cursor.description, rows))
-                                else:
-                                    # No result set, but might have affected rows
-                                    result_sets.append((None, cursor.rowcount))
-                                
-                                # Move to next result set
-                                if not cursor.nextset():
-                                    break
+                            formatted, rows = outcome.result()
+                        except pyodbc.DatabaseError as e:
+                            emit(f"\n{_RULE_80}\nError in Statement {i} on {db}: {str(e)}\n{_RULE_80}\n")
+                            db_errors.append(f"Statement {i}: {str(e)}")
+                            continue
+                        for result in formatted:
+                            emit(result)
+                        db_total_rows += rows
+                else:
+                    with self.db_manager.database_connection(db, autocommit=read_only) as conn:
+                        cursor = conn.cursor()
+                        cursor.arraysize = self.FETCH_ARRAYSIZE
+                        per_batch = self.commit_mode == "per_batch" and not read_only
+                        commit_each = not read_only and not per_batch
+                    
+                        # Savepoints only once a statement has succeeded; before that no
+                        # transaction is open and there is no earlier work to protect
+                        txn_open = False
+                        pending = deque(statements)
+                        i = 0
+                        while pending:
+                            statement = pending.popleft()
+                            i += 1
+                            saved = per_batch and txn_open and self._savepoint(cursor)
+                            if isinstance(statement, InsertBatch):
+                                # Keep numbering in terms of the original statements
+                                last = i + len(statement.rows) - 1
+                                try:
+                                    emit(self._execute_insert_batch(cursor, statement, db, i, last))
+                                    if commit_each:
+                                        conn.commit()
+                                    txn_open = per_batch
+                                    db_statement_count += len(statement.rows)
+                                    i = last
+                                except pyodbc.DatabaseError:
+                                    # Undo the rows that went in, then run the original statements
+                                    # one at a time so each row reports its own result
+                                    if not per_batch:
+                                        conn.rollback()
+                                    elif self._undo_statement(cursor, conn, saved):
+                                        db_errors.append(f"Transaction: statements before {i} were rolled back")
+                                        txn_open = False
+                                    pending.extendleft(reversed(statement.statements))
+                                    i -= 1
+                                continue
+                        
+                            db_statement_count += 1
+                            try:
+                                formatted, rows = self._run_statement(cursor, statement, db, i)
+                                for result in formatted:
+                                    emit(result)
+                                db_total_rows += rows
                             
-                            # Format results
-                            if result_sets:
-                                for j, result_set in enumerate(result_sets):
-                                    description, data = result_set
-                                    if description:  # Has columns
-                                        result = self._format_query_results(description, data, db, i, j+1 if len(result_sets) > 1 else None)
-                                        db_results.append(result)
-                                        db_total_rows += len(data)
-                                    else:  # Just row count
-                                        if data > 0:
-                                            result = f"\n{'═' * 80}\n📋 Statement {i} executed on {db}\n{'═' * 80}\n✅ Rows affected: {data}\n{'═' * 80}\n"
-                                        else:
-                                            result = f"\n{'═' * 80}\n📋 Statement {i} executed on {db}\n{'═' * 80}\n✅ Command completed successfully\n{'═' * 80}\n"
-                                        db_results.append(result)
-                            else:
-                                # No results at all
-                                result = f"\n{'═' * 80}\n📋 Statement {i} executed on {db}\n{'═' * 80}\n✅ Command completed successfully\n{'═' * 80}\n"
-                                db_results.append(result)
+                                # Commit after each statement to ensure it's completed
+                                if commit_each:
+                                    conn.commit()
+                                txn_open = per_batch
                             
-                            # Commit after each statement to ensure it's completed
+                            except pyodbc.DatabaseError as e:
+                                error_msg = f"\n{_RULE_80}\nError in Statement {i} on {db}: {str(e)}\n{_RULE_80}\n"
+                                emit(error_msg)
+                                db_errors.append(f"Statement {i}: {str(e)}")
+                                if per_batch and self._undo_statement(cursor, conn, saved):
+                                    db_errors.append(f"Transaction: statements before {i} were rolled back")
+                                    txn_open = False
+                                # Don't break - continue with next statement
+                    
+                        if per_batch:
                             conn.commit()
-                            
-                        except pyodbc.DatabaseError as e:
-                            error_msg = f"\n{'═' * 80}\nError in Statement {i} on {db}: {str(e)}\n{'═' * 80}\n"
-                            db_results.append(error_msg)
-                            db_errors.append(f"Statement {i}: {str(e)}")
-                            # Don't break - continue with next statement
                     
             except Exception as e:
-                error_msg = f"\n{'═' * 80}\nConnection error with {db}: {str(e)}\n{'═' * 80}\n"
-                db_results.append(error_msg)
+                error_msg = f"\n{_RULE_80}\nConnection error with {db}: {str(e)}\n{_RULE_80}\n"
+                emit(error_msg)
                 db_errors.append(f"Connection: {str(e)}")
             
             db_exec_time = time.time() - db_start_time
@@ -318,6 +531,99 @@ class QueryExecutor:
                 'results': db_results
             }
 
+        def _run_statement(self, cursor, statement, db, i):
+            """Execute one statement and return (formatted results, rows returned)"""
+            formatted = []
+            total_rows = 0
+
+            # For each statement, execute it completely
+            cursor.execute(statement)
+
+            # Handle multiple result sets (especially for stored procedures)
+            result_sets = []
+
+            while True:
+                if cursor.description:
+                    # Single C-level pull instead of a Python loop over batches
+                    rows = cursor.fetchall()
+                    if rows:
+                        result_sets.append((cursor.description, rows))
+                else:
+                    # No result set, but might have affected rows
+                    result_sets.append((None, cursor.rowcount))
+
+                # Move to next result set
+                if not cursor.nextset():
+                    break
+
+            # Format results
+            if result_sets:
+                for j, result_set in enumerate(result_sets):
+                    description, data = result_set
+                    if description:  # Has columns
+                        result = self._format_query_results(description, data, db, i, j+1 if len(result_sets) > 1 else None)
+                        formatted.append(result)
+                        total_rows += len(data)
+                    else:  # Just row count
+                        if data > 0:
+                            result = f"\n{_RULE_80}\n📋 Statement {i} executed on {db}\n{_RULE_80}\n✅ Rows affected: {data}\n{_RULE_80}\n"
+                        else:
+                            result = f"\n{_RULE_80}\n📋 Statement {i} executed on {db}\n{_RULE_80}\n✅ Command completed successfully\n{_RULE_80}\n"
+                        formatted.append(result)
+            else:
+                # No results at all
+                result = f"\n{_RULE_80}\n📋 Statement {i} executed on {db}\n{_RULE_80}\n✅ Command completed successfully\n{_RULE_80}\n"
+                formatted.append(result)
+
+            return formatted, total_rows
+
+        def _run_isolated_statement(self, db, statement, i):
+            """Run a statement on its own pooled connection"""
+            with self.db_manager.database_connection(db, autocommit=True) as conn:
+                cursor = conn.cursor()
+                cursor.arraysize = self.FETCH_ARRAYSIZE
+                return self._run_statement(cursor, statement, db, i)
+
+        def _savepoint(self, cursor):
+            """Mark the start of a statement inside the open transaction"""
+            try:
+                cursor.execute(f"SAVE TRANSACTION {self.SAVEPOINT_NAME}")
+                return True
+            except pyodbc.DatabaseError:
+                return False
+
+        def _undo_statement(self, cursor, conn, saved):
+            """Roll back a failed statement in per-batch mode
+
+            Returns True when the transaction could not be kept and all
+            uncommitted work on this database was rolled back.
+            """
+            if not saved:
+                # No earlier statement succeeded, so only this one's leftovers are discarded
+                conn.rollback()
+                return False
+            try:
+                state = cursor.execute("SELECT XACT_STATE()").fetchone()[0]
+                if state == 1:
+                    cursor.execute(f"ROLLBACK TRANSACTION {self.SAVEPOINT_NAME}")
+                    return False
+            except pyodbc.DatabaseError:
+                pass
+            # Transaction doomed (-1) or already gone (0): the earlier work is lost
+            conn.rollback()
+            return True
+
+        @staticmethod
+        def _execute_insert_batch(cursor, batch, db, first, last):
+            """Run an InsertBatch with one round trip per parameter page"""
+            cursor.fast_executemany = True
+            try:
+                cursor.executemany(batch.sql, batch.rows)
+            finally:
+                cursor.fast_executemany = False
+            return (f"\n{_RULE_80}\n📋 Statements {first}-{last} executed on {db} (batched INSERT)\n"
+                    f"{_RULE_80}\n✅ Rows affected: {len(batch.rows)}\n{_RULE_80}\n")
+
         def _format_query_results(self, description, rows, db_name, statement_num, result_set_num=None):
             """Format query results for display with enhanced tabular styling"""
             # Build title
@@ -326,36 +632,31 @@ class QueryExecutor:
                 title += f" (Result Set {result_set_num})"
             
             if not rows:
-                return f"\n{'═' * 80}\n{title}\n{'═' * 80}\n⚠️  No rows returned\n{'═' * 80}\n"
+                return f"\n{_RULE_80}\n{title}\n{_RULE_80}\n⚠️  No rows returned\n{_RULE_80}\n"
             
             column_names = [c[0] for c in description]
+            # Stringify every displayed cell once; widths and rendering both reuse it
+            shown_rows = rows[:self.max_display_rows]
+            str_rows = [[str(value) for value in row] for row in shown_rows]
             
             # Calculate column widths with minimum and maximum limits
             min_width = 8
             max_width = 30
-            col_widths = []
-            
-            for i, name in enumerate(column_names):
-                # Calculate width based on column name and data
-                name_width = len(str(name))
-                data_widths = [len(str(row[i])) for row in rows[:100]]  # Sample first 100 rows for performance
-                max_data_width = max(data_widths) if data_widths else 0
-                
-                # Set width with constraints
-                width = max(min_width, min(max_width, max(name_width, max_data_width)))
-                col_widths.append(width)
+            # Sample first 100 rows for performance, one pass over all columns
+            max_data_widths = [max(map(len, column)) for column in zip(*str_rows[:100])]
+            col_widths = [
+                max(min_width, min(max_width, max(len(str(name)), data_width)))
+                for name, data_width in zip(column_names, max_data_widths)
+            ]
             
-            # Build the table with box drawing characters
-            def truncate_text(text, width):
-                text = str(text)
-                if len(text) <= width:
-                    return text
-                return text[:width-3] + "..."
+            # Build the table with box drawing characters; rows are padded by
+            # one format call with the column widths baked in
+            row_format = "│ " + " │ ".join(f"{{:<{width}}}" for width in col_widths) + " │\n"
             
             # Header section
-            header_line = f"\n{'═' * 100}\n"
-            title_line = f"{title} (Showing {len(rows):,} rows)\n"
-            separator_line = f"{'═' * 100}\n"
+            header_line = f"\n{_RULE_100}\n"
+            title_line = f"{title} (Showing {len(shown_rows):,} rows)\n"
+            separator_line = f"{_RULE_100}\n"
             
             # Column headers with box drawing
             header_top = "┌" + "┬".join("─" * (width + 2) for width in col_widths) + "┐"
@@ -364,53 +665,45 @@ class QueryExecutor:
             ) + " │"
             header_bottom = "├" + "┼".join("─" * (width + 2) for width in col_widths) + "┤"
             
-            # Data rows
-            data_rows = []
-            for row in rows:
-                row_content = "│ " + " │ ".join(
-                    truncate_text(value, width).ljust(width)
-                    for value, width in zip(row, col_widths)
-                ) + " │"
-                data_rows.append(row_content)
-            
             # Table footer
             table_footer = "└" + "┴".join("─" * (width + 2) for width in col_widths) + "┘"
             
-            # Combine all parts
-            table_parts = [
-                header_line,
-                title_line,
-                separator_line,
-                header_top,
-                header_content,
-                header_bottom,
-                *data_rows,
-                table_footer,
-                f"\n✅ Total rows: {len(rows):,}\n{'═' * 100}\n"
-            ]
+            # Write all parts into one buffer, newline-separated
+            out = io.StringIO()
+            for part in (header_line, title_line, separator_line, header_top, header_content, header_bottom):
+                out.write(part)
+                out.write("\n")
             
-            return "\n".join(table_parts)
+            # Data rows
+            for row in str_rows:
+                out.write(row_format.format(*[
+                    value if len(value) <= width else value[:width-3] + "..."
+                    for value, width in zip(row, col_widths)
+                ]))
+            
+            out.write(table_footer)
+            if len(shown_rows) < len(rows):
+                out.write(f"\n⚠️ Showing first {len(shown_rows):,} of {len(rows):,} rows")
+            out.write(f"\n\n✅ Total rows: {len(rows):,}\n{_RULE_100}\n")
+            return out.getvalue()
+
+        def _send_database_results(self, db_info):
+            """Send the results of a single database to the UI"""
+            for result in db_info['results']:
+                self.post("result", result)
 
-        def _send_results(self, databases_info, total_exec_time, overall_total_rows):
-            """Send results to message queue"""
-            # Generate and send the detailed execution summary first
+        def _send_summary(self, databases_info, total_exec_time, overall_total_rows):
+            """Send the detailed execution summary to the UI"""
             summary = self._generate_execution_summary(databases_info, total_exec_time, overall_total_rows)
-            self.message_queue.put(("execution_summary", summary))
-            
-            # Send results in reverse order (last executed database first)
-            for db_info in reversed(databases_info):
-                for result in db_info['results']:
-                    self.message_queue.put(("result", result))
+            self.post("execution_summary", summary)
 
         def _generate_execution_summary(self, databases_info, total_exec_time, overall_total_rows):
             """Generate execution summary in clean tabular format"""
-            from datetime import datetime
-            
             # Summary header
             summary_lines = []
-            summary_lines.append("=" * 100)
+            summary_lines.append(_ASCII_RULE_100)
             summary_lines.append("EXECUTION SUMMARY")
-            summary_lines.append("=" * 100)
+            summary_lines.append(_ASCII_RULE_100)
             summary_lines.append(f"Total Execution Time: {total_exec_time:.3f} seconds")
             summary_lines.append(f"Overall Total Rows  : {overall_total_rows:,}")
             summary_lines.append(f"Databases Processed : {len(databases_info)}")
@@ -419,22 +712,19 @@ class QueryExecutor:
             
             # Database results table
             summary_lines.append("DATABASE EXECUTION DETAILS")
-            summary_lines.append("=" * 100)
+            summary_lines.append(_ASCII_RULE_100)
             
             # Table headers
             headers = ["Database", "Time(s)", "Rows", "Statements", "Status", "Errors"]
             col_widths = [20, 10, 12, 12, 10, 30]
             
             # Header row
-            header_row = "|"
-            for header, width in zip(headers, col_widths):
-                header_row += f" {header:<{width-1}}|"
-            summary_lines.append(header_row)
+            # One template for the header and every data row
+            row_format = "|" + "".join(f" {{:<{width-1}}}|" for width in col_widths)
+            summary_lines.append(row_format.format(*headers))
             
             # Separator row
-            sep_row = "|"
-            for width in col_widths:
-                sep_row += "-" * width + "|"
+            sep_row = "|" + "".join("-" * width + "|" for width in col_widths)
             summary_lines.append(sep_row)
             
             # Data rows
@@ -456,14 +746,11 @@ class QueryExecutor:
                 
                 # Build row
                 row_data = [db_name, db_time, db_rows, db_statements, db_status, error_summary]
-                data_row = "|"
-                for data, width in zip(row_data, col_widths):
-                    data_row += f" {str(data):<{width-1}}|"
-                summary_lines.append(data_row)
+                summary_lines.append(row_format.format(*row_data))
             
             # Table footer
             summary_lines.append(sep_row)
-            summary_lines.append("=" * 100)
+            summary_lines.append(_ASCII_RULE_100)
             summary_lines.append("")
             
             return "\n".join(summary_lines)
\ No newline at end of file
@@ -3,32 +3,47 @@ from tkinter import ttk, messagebox
 import threading
 
 class ConnectionUI:
-    def __init__(self, root, app_controller):
+    # Label, entry attribute, variable attribute and default value of each login field
+    FIELDS = (
+        ("Server:", "server_entry", "server_var", "localhost\\SQLEXPRESS"),
+        ("Username:", "username_entry", "username_var", "sa"),
+        ("Password:", "password_entry", "password_var", "")
+    )
+    ENTER_BINDTAG = "ConnectionForm"
+
+    def __init__(self, root, app_controller, theme):
         self.root = root
         self.app = app_controller
+        self.theme = theme
         self.conn_frame = None
         
         # UI elements
         self.server_entry = None
         self.username_entry = None
         self.password_entry = None
+        self.server_var = None
+        self.username_var = None
+        self.password_var = None
         self.connect_button = None
         self.progress = None
         self.status_label = None
+        self._return_binding = None
         
         self.build_ui()
 
     def build_ui(self):
         """Build connection UI - Complete implementation from original build_connection_ui"""
-        if hasattr(self, 'conn_frame') and self.conn_frame:
-            self.conn_frame.destroy()
+        # Widgets are created once; a second call only resets the form
+        if self.conn_frame:
+            self.reset_form()
+            return
 
-        self.conn_frame = tk.Frame(self.root, bg=self.app.bg_color)
+        self.conn_frame = tk.Frame(self.root, bg=self.theme.bg_color)
         
         # Card frame with subtle shadow effect
         card_frame = tk.Frame(
             self.conn_frame, 
-            bg=self.app.card_bg, 
+            bg=self.theme.card_bg, 
             bd=0,
             highlightbackground="#e0e0e0", 
             highlightthickness=1,
@@ -51,21 +66,21 @@ class ConnectionUI:
 
     def _build_logo_section(self, parent):
         """Build logo and title section"""
-        logo_frame = tk.Frame(parent, bg=self.app.card_bg)
+        logo_frame = tk.Frame(parent, bg=self.theme.card_bg)
         logo_frame.pack(fill="x", pady=(0, 20))
         
         # Logo image
         if self.app.logo_image:
-            logo_label = tk.Label(logo_frame, image=self.app.logo_image, bg=self.app.card_bg)
+            logo_label = tk.Label(logo_frame, image=self.app.logo_image, bg=self.theme.card_bg)
             logo_label.pack(pady=(0, 10))
         
         # Company title
         tk.Label(
             logo_frame, 
             text="Zanvar Group of Industries", 
-            font=('Segoe UI', 18, 'bold'),
-            bg=self.app.card_bg, 
-            fg=self.app.primary_color
+            font=self.app.style_manager.logo_title_font,
+            bg=self.theme.card_bg, 
+            fg=self.theme.primary_color
         ).pack()
         
         # Subtitle
@@ -73,51 +88,49 @@ class ConnectionUI:
             logo_frame, 
             text="Login to your database", 
             font=('Segoe UI', 12),
-            bg=self.app.card_bg, 
-            fg=self.app.muted_color
+            bg=self.theme.card_bg, 
+            fg=self.theme.muted_color
         ).pack(pady=(5, 10))
 
     def _build_input_fields(self, parent):
         """Build input fields with modern styling"""
-        input_frame = tk.Frame(parent, bg=self.app.card_bg)
+        input_frame = tk.Frame(parent, bg=self.theme.card_bg)
         input_frame.pack(fill="x", pady=(10, 0))
         
-        # Field definitions with labels, attribute names, and default values
-        fields = [
-            ("Server:", "server_entry", "localhost\\SQLEXPRESS"),
-            ("Username:", "username_entry", "sa"),
-            ("Password:", "password_entry", "")
-        ]
-
-        for i, (label_text, attr_name, default) in enumerate(fields):
+        label_cls, entry_cls = ttk.Label, ttk.Entry
+        label_font, entry_font = self.theme.font_label, self.theme.font_normal
+        entries = []
+        for i, (label_text, attr_name, var_name, default) in enumerate(self.FIELDS):
             # Label
-            ttk.Label(
+            label_cls(
                 input_frame, 
                 text=label_text, 
                 style='Header.TLabel',
-                font=self.app.font_label
+                font=label_font
             ).grid(row=i, column=0, sticky="w", padx=(5, 10), pady=8)
             
-            # Entry field
-            entry = ttk.Entry(
+            # Entry field backed by a variable; the password is masked from creation on
+            var = tk.StringVar(input_frame, value=default)
+            setattr(self, var_name, var)
+            entry = entry_cls(
                 input_frame, 
                 width=35, 
-                font=self.app.font_normal
+                font=entry_font,
+                textvariable=var,
+                show="•" if "password" in attr_name else ""
             )
-            entry.insert(0, default)
             entry.grid(row=i, column=1, sticky="ew", padx=5, pady=5)
+            entries.append(entry)
+        
+        for (_, attr_name, _, _), entry in zip(self.FIELDS, entries):
             setattr(self, attr_name, entry)
-            
-            # Special handling for password field
-            if "password" in attr_name:
-                entry.config(show="•")
         
         # Make the entry column expandable
         input_frame.grid_columnconfigure(1, weight=1)
 
     def _build_buttons(self, parent):
         """Build buttons with modern styling"""
-        button_frame = tk.Frame(parent, bg=self.app.card_bg)
+        button_frame = tk.Frame(parent, bg=self.theme.card_bg)
         button_frame.pack(fill="x", pady=(20, 10))
         
         # Connect button
@@ -140,7 +153,7 @@ class ConnectionUI:
     def _build_progress_status(self, parent):
         """Build progress bar and status label with reserved space"""
         # Progress and status container with fixed height
-        progress_container = tk.Frame(parent, bg=self.app.card_bg, height=60)
+        progress_container = tk.Frame(parent, bg=self.theme.card_bg, height=60)
         progress_container.pack(fill="x", pady=(10, 0))
         progress_container.pack_propagate(False)  # Maintain fixed height
         
@@ -158,18 +171,18 @@ class ConnectionUI:
         self.status_label = tk.Label(
             progress_container, 
             text="Not connected", 
-            fg=self.app.muted_color, 
-            bg=self.app.card_bg, 
-            font=self.app.font_bold,
+            fg=self.theme.muted_color, 
+            bg=self.theme.card_bg, 
+            font=self.theme.font_bold,
             height=2  # Fixed height
         )
         self.status_label.pack(side="bottom", fill="x", pady=(5, 0))
 
-    def connect_to_server(self):
+    def connect_to_server(self, event=None):
         """Handle server connection - Complete logic from original method"""
-        server = self.server_entry.get().strip()
-        username = self.username_entry.get().strip()
-        password = self.password_entry.get()
+        server = self.server_var.get().strip()
+        username = self.username_var.get().strip()
+        password = self.password_var.get()
         
         # Validate inputs
         if not server:
@@ -183,7 +196,7 @@ class ConnectionUI:
         self.connect_button.config(state="disabled")
         self.progress.pack(pady=(10, 0), fill="x")
         self.progress.start()
-        self.status_label.config(text="Connecting...", fg=self.app.accent_color)
+        self.status_label.config(text="Connecting...", fg=self.theme.accent_color)
         
         # Start connection attempt through app controller
         self.app.connect_to_server(server, username, password)
@@ -192,60 +205,52 @@ class ConnectionUI:
         """Handle successful connection message"""
         self.progress.stop()
         self.progress.pack_forget()
-        self.status_label.config(text=message, fg=self.app.success_color)
+        self.status_label.config(text=message, fg=self.theme.success_color)
         self.connect_button.config(state="normal")
 
     def show_error(self, message):
         """Handle error messages"""
         self.progress.stop()
         self.progress.pack_forget()
-        self.status_label.config(text=message, fg=self.app.error_color)
+        self.status_label.config(text=message, fg=self.theme.error_color)
         self.connect_button.config(state="normal")
 
     def show(self):
         """Show connection UI"""
         if self.conn_frame:
             self.conn_frame.pack(expand=True, fill="both")
+            self.bind_enter_key()
 
     def hide(self):
         """Hide connection UI"""
         if self.conn_frame:
             self.conn_frame.pack_forget()
+            self.unbind_enter_key()
 
     def reset_form(self):
         """Reset the connection form to default values"""
-        self.server_entry.delete(0, tk.END)
-        self.server_entry.insert(0, "localhost\\SQLEXPRESS")
-        
-        self.username_entry.delete(0, tk.END)
-        self.username_entry.insert(0, "sa")
-        
-        self.password_entry.delete(0, tk.END)
+        for _, _, var_name, default in self.FIELDS:
+            getattr(self, var_name).set(default)
         
         # Reset status and hide progress bar
         self.progress.stop()
         self.progress.pack_forget()
-        self.status_label.config(text="Not connected", fg=self.app.muted_color)
+        self.status_label.config(text="Not connected", fg=self.theme.muted_color)
         self.connect_button.config(state="normal")
 
     def get_connection_details(self):
         """Get current connection form values"""
         return {
-            'server': self.server_entry.get().strip(),
-            'username': self.username_entry.get().strip(),
-            'password': self.password_entry.get()
+            'server': self.server_var.get().strip(),
+            'username': self.username_var.get().strip(),
+            'password': self.password_var.get()
         }
 
     def set_connection_details(self, server="", username="", password=""):
         """Set connection form values"""
-        self.server_entry.delete(0, tk.END)
-        self.server_entry.insert(0, server)
-        
-        self.username_entry.delete(0, tk.END)
-        self.username_entry.insert(0, username)
-        
-        self.password_entry.delete(0, tk.END)
-        self.password_entry.insert(0, password)
+        self.server_var.set(server)
+        self.username_var.set(username)
+        self.password_var.set(password)
 
     def enable_form(self, enabled=True):
         """Enable or disable the connection form"""
@@ -257,6 +262,18 @@ class ConnectionUI:
 
     def bind_enter_key(self):
         """Bind Enter key to connect button"""
-        self.server_entry.bind('<Return>', lambda e: self.connect_to_server())
-        self.username_entry.bind('<Return>', lambda e: self.connect_to_server())
-        self.password_entry.bind('<Return>', lambda e: self.connect_to_server())
\ No newline at end of file
+        # One class binding shared by the form's entries via an extra bindtag
+        if self._return_binding is None:
+            for _, attr_name, _, _ in self.FIELDS:
+                entry = getattr(self, attr_name)
+                tags = entry.bindtags()
+                if self.ENTER_BINDTAG not in tags:
+                    entry.bindtags((self.ENTER_BINDTAG,) + tags)
+            self._return_binding = self.root.bind_class(self.ENTER_BINDTAG, '<Return>', self.connect_to_server)
+
+    def unbind_enter_key(self):
+        """Remove the Enter key binding installed by bind_enter_key"""
+        if self._return_binding is not None:
+            self.root.unbind_class(self.ENTER_BINDTAG, '<Return>')
+            self.root.deletecommand(self._return_binding)
+            self._return_binding = None
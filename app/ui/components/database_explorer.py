@@ -2,9 +2,12 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 class DatabaseExplorer:
-    def __init__(self, parent, app_controller):
+    POPULATE_CHUNK_SIZE = 64
+
+    def __init__(self, parent, app_controller, theme):
         self.parent = parent
         self.app = app_controller
+        self.theme = theme
         self.db_vars = {}
         self.db_checkbuttons = {}
         self.select_all_var = tk.BooleanVar()
@@ -16,7 +19,7 @@ class DatabaseExplorer:
 
     def build_explorer(self):
         """Build complete database explorer UI - Complete implementation from original build_db_explorer"""
-        cf = tk.Frame(self.parent, bg=self.app.bg_color)
+        cf = tk.Frame(self.parent, bg=self.theme.bg_color)
         cf.pack(fill="both", expand=True, pady=10)
         
         # Select All section
@@ -26,9 +29,9 @@ class DatabaseExplorer:
         tk.Label(
             cf, 
             text="Available Databases:", 
-            bg=self.app.bg_color,
-            fg=self.app.primary_color,
-            font=self.app.font_header
+            bg=self.theme.bg_color,
+            fg=self.theme.primary_color,
+            font=self.theme.font_header
         ).pack(anchor="w", pady=(5, 5))
         
         # Database checkboxes with scrolling
@@ -36,15 +39,15 @@ class DatabaseExplorer:
 
     def _build_select_all_section(self, parent):
         """Build select all checkbox section"""
-        select_all_frame = tk.Frame(parent, bg=self.app.bg_color)
+        select_all_frame = tk.Frame(parent, bg=self.theme.bg_color)
         select_all_frame.pack(fill="x", pady=(0, 5))
         
         self.select_all_cb = tk.Label(
             select_all_frame, 
             text="☐ Select All Databases",
-            font=self.app.font_database,
-            bg=self.app.bg_color,
-            fg=self.app.primary_color,
+            font=self.theme.font_database,
+            bg=self.theme.bg_color,
+            fg=self.theme.primary_color,
             cursor="hand2"
         )
         self.select_all_cb.pack(side="left")
@@ -55,15 +58,15 @@ class DatabaseExplorer:
     def _build_scrollable_database_list(self, parent):
         """Build scrollable database list with canvas and scrollbar"""
         # Create a frame to hold canvas and scrollbar
-        scroll_frame = tk.Frame(parent, bg=self.app.bg_color)
+        scroll_frame = tk.Frame(parent, bg=self.theme.bg_color)
         scroll_frame.pack(fill="both", expand=True)
         scroll_frame.grid_columnconfigure(0, weight=1)
         scroll_frame.grid_rowconfigure(0, weight=1)
         
         # Create canvas and scrollbar
-        self.canvas = tk.Canvas(scroll_frame, bg=self.app.bg_color, highlightthickness=0)
+        self.canvas = tk.Canvas(scroll_frame, bg=self.theme.bg_color, highlightthickness=0)
         self.scrollbar = ttk.Scrollbar(scroll_frame, orient="vertical", command=self.canvas.yview)
-        self.db_vars_frame = tk.Frame(self.canvas, bg=self.app.bg_color)
+        self.db_vars_frame = tk.Frame(self.canvas, bg=self.theme.bg_color)
         
         # Configure scrolling
         self.db_vars_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
@@ -100,9 +103,12 @@ class DatabaseExplorer:
         # Clear existing databases
         self.clear_databases()
         
-        # Create checkbox for each database
-        for db in databases:
+        # Create checkboxes in chunks, letting Tk lay out each chunk so long
+        # database lists don't freeze the window
+        for i, db in enumerate(databases, 1):
             self.create_db_checkbox(db)
+            if i % self.POPULATE_CHUNK_SIZE == 0:
+                self.db_vars_frame.update_idletasks()
         
         # Update canvas scroll region
         if self.canvas:
@@ -115,9 +121,9 @@ class DatabaseExplorer:
         cb = tk.Label(
             self.db_vars_frame, 
             text=f"☐ {db_name}",
-            font=self.app.font_database,
-            bg=self.app.bg_color,
-            fg=self.app.primary_color,
+            font=self.theme.font_database,
+            bg=self.theme.bg_color,
+            fg=self.theme.primary_color,
             cursor="hand2"
         )
         cb.pack(anchor="w", padx=8, pady=5)
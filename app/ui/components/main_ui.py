@@ -6,12 +6,22 @@ from .database_explorer import DatabaseExplorer
 from .query_editor import QueryEditor
 from .result_viewer import ResultViewer
 from datetime import datetime
-import hashlib
+from enum import Enum
+
+
+class ConnStatus(Enum):
+    CONNECTED = "connected"
+    UNKNOWN = "unknown"
+    ERROR = "error"
+
 
 class MainUI:
-    def __init__(self, root, app_controller):
+    EXPORT_BUFFER_SIZE = 1 << 20
+
+    def __init__(self, root, app_controller, theme):
         self.root = root
         self.app = app_controller
+        self.theme = theme
         self.main_frame = None
         
         # UI components
@@ -23,19 +33,35 @@ class MainUI:
         self.run_query_btn = None
         self.save_log_btn = None
         
+        # Sash positions as fractions of their pane's size, captured from the first layout
+        self._paned = None
+        self._query_pane = None
+        self._sash_fractions = None
+        self._layout_size = None
+        self._layout_pending = False
+        
         # Connection status elements
         self.connection_status_frame = None
-        self.server_label = None
-        self.username_label = None
+        self._status_icon_label = None
+        self._prefix_label = None
+        self._username_label = None
+        self._on_label = None
+        self._server_label = None
+        self._last_status_key = None
+        # app.connection_epoch the status labels were last refreshed for
+        self._status_epoch = None
+        self._refresh_pending = False
         
         self.build_ui()
 
     def build_ui(self):
         """Build main application UI - Complete implementation from original build_main_ui"""
-        if hasattr(self, 'main_frame') and self.main_frame:
-            self.main_frame.destroy()
+        # Widgets are created once; a second call only refreshes what can change
+        if self.main_frame:
+            self.refresh_connection_status()
+            return
 
-        self.main_frame = tk.Frame(self.root, bg=self.app.bg_color)
+        self.main_frame = tk.Frame(self.root, bg=self.theme.bg_color)
         
         # Modern header with all buttons
         self.build_main_ui_header()
@@ -53,16 +79,22 @@ class MainUI:
         # This creates approximately 2.5% left and 97.5% right split
         paned.add(left_panel, weight=1)
         paned.add(right_panel, weight=39)
+        self._paned = paned
         
         # Build components
         self.build_database_explorer(left_panel)
         self.build_query_view(right_panel)
 
+        # Place the sashes once per burst of resize events
+        self.main_frame.bind("<Configure>", self._on_main_configure)
+        for pane in (self._paned, self._query_pane):
+            pane.bind("<ButtonRelease-1>", self._capture_sash_fractions, add="+")
+
     def build_main_ui_header(self):
         """Build modern header with connection status and all action buttons - Complete from original"""
         header_frame = tk.Frame(
             self.main_frame, 
-            bg=self.app.card_bg, 
+            bg=self.theme.card_bg, 
             pady=15,
             highlightbackground="#e0e0e0",
             highlightthickness=1
@@ -85,95 +117,77 @@ class MainUI:
         ).grid(row=0, column=2, sticky="e", padx=10)
 
     def _build_connection_status(self, parent):
-        """Build connection status display - FIXED VERSION"""
-        # Clear existing connection status frame if it exists
-        if hasattr(self, 'connection_status_frame') and self.connection_status_frame:
-            self.connection_status_frame.destroy()
-        
-        self.connection_status_frame = tk.Frame(parent, bg=self.app.card_bg)
-        self.connection_status_frame.grid(row=0, column=0, sticky="w", padx=10)
-        
-        # Try to get server info from app controller
-        try:
-            # Check if the app controller has connection info stored
-            if hasattr(self.app, 'current_server_info') and self.app.current_server_info:
-                server_info = self.app.current_server_info
-            elif hasattr(self.app, 'connection_details') and self.app.connection_details:
-                server_info = self.app.connection_details
-            elif hasattr(self.app, 'server') and hasattr(self.app, 'username'):
-                server_info = {
-                    'server': self.app.server,
-                    'username': self.app.username
-                }
+        """Build connection status display"""
+        if self.connection_status_frame is None:
+            self._create_connection_status_widgets(parent)
+        epoch = self.app.connection_epoch
+        if epoch != self._status_epoch:
+            self._status_epoch = epoch
+            try:
+                server_info = self.app.get_current_server_info()
+            except AttributeError:
+                # Controller without connection tracking
+                self._update_connection_status(None, ConnStatus.ERROR)
             else:
-                # Fallback: try to get from connection UI if available
-                if hasattr(self.app, 'connection_ui') and self.app.connection_ui:
-                    details = self.app.connection_ui.get_connection_details()
-                    if details and details.get('server') and details.get('username'):
-                        server_info = details
-                    else:
-                        server_info = None
-                else:
-                    server_info = None
-            
+                self._update_connection_status(server_info)
+
+    def _create_connection_status_widgets(self, parent):
+        """Create the status labels once; later updates only reconfigure them"""
+        theme = self.theme
+        bg, fg_primary = theme.card_bg, theme.primary_color
+        font_n, font_b = theme.font_normal, self.app.style_manager.status_bold_font
+
+        frame = self.connection_status_frame = tk.Frame(parent, bg=bg)
+        frame.grid(row=0, column=0, sticky="w", padx=10)
+
+        self._status_icon_label = tk.Label(frame, bg=bg, font=font_n)
+        self._prefix_label = tk.Label(frame, bg=bg, font=font_n)
+        self._username_label = tk.Label(frame, bg=bg, fg=fg_primary, font=font_b)
+        self._on_label = tk.Label(frame, bg=bg, fg=fg_primary, font=font_n)
+        self._server_label = tk.Label(frame, bg=bg, fg=fg_primary, font=font_b)
+        for label in (self._status_icon_label, self._prefix_label, self._username_label,
+                      self._on_label, self._server_label):
+            label.pack(side="left", anchor="center")
+        self._last_status_key = None
+
+    def _update_connection_status(self, server_info, status=None):
+        """Reconfigure the existing status labels; no-op when nothing changed"""
+        if status is None:
             if server_info and server_info.get('server') and server_info.get('username'):
-                # Connected status with proper labels
-                tk.Label(
-                    self.connection_status_frame, 
-                    text="🟢 Connected to: ", 
-                    bg=self.app.card_bg,
-                    fg=self.app.success_color,
-                    font=self.app.font_normal
-                ).pack(side="left", anchor="center")
-                
-                self.username_label = tk.Label(
-                    self.connection_status_frame, 
-                    text=f"{server_info.get('username', 'Unknown')} ", 
-                    bg=self.app.card_bg,
-                    fg=self.app.primary_color,
-                    font=('Segoe UI', 10, 'bold')
-                )
-                self.username_label.pack(side="left", anchor="center")
-                
-                tk.Label(
-                    self.connection_status_frame, 
-                    text="on ", 
-                    bg=self.app.card_bg,
-                    fg=self.app.primary_color,
-                    font=self.app.font_normal
-                ).pack(side="left", anchor="center")
-                
-                self.server_label = tk.Label(
-                    self.connection_status_frame, 
-                    text=server_info.get('server', 'Unknown'),
-                    bg=self.app.card_bg,
-                    fg=self.app.primary_color,
-                    font=('Segoe UI', 10, 'bold')
-                )
-                self.server_label.pack(side="left", anchor="center")
+                status = ConnStatus.CONNECTED
             else:
-                # Fallback status if connection info is not available
-                tk.Label(
-                    self.connection_status_frame, 
-                    text="🟡 Connection Status Unknown", 
-                    bg=self.app.card_bg,
-                    fg=self.app.muted_color,
-                    font=self.app.font_normal
-                ).pack(side="left", anchor="center")
-                
-        except Exception as e:
-            # Error handling - show error status
-            tk.Label(
-                self.connection_status_frame, 
-                text="🔴 Connection Status Error", 
-                bg=self.app.card_bg,
-                fg=self.app.error_color,
-                font=self.app.font_normal
-            ).pack(side="left", anchor="center")
+                status = ConnStatus.UNKNOWN
+        if status is ConnStatus.CONNECTED:
+            key = (status, server_info['server'], server_info['username'])
+        else:
+            key = (status, None, None)
+        if key == self._last_status_key:
+            return
+        self._last_status_key = key
+
+        _, server, username = key
+        if status is ConnStatus.CONNECTED:
+            fg_ok = self.theme.success_color
+            self._status_icon_label.config(text="🟢", fg=fg_ok)
+            self._prefix_label.config(text="Connected to: ", fg=fg_ok)
+            self._username_label.config(text=f"{username} ")
+            self._on_label.config(text="on ")
+            self._server_label.config(text=server)
+            return
+
+        if status is ConnStatus.ERROR:
+            icon, text, fg = "🔴", "Connection Status Error", self.theme.error_color
+        else:
+            icon, text, fg = "🟡", "Connection Status Unknown", self.theme.muted_color
+        self._status_icon_label.config(text=icon, fg=fg)
+        self._prefix_label.config(text=text, fg=fg)
+        self._username_label.config(text="")
+        self._on_label.config(text="")
+        self._server_label.config(text="")
 
     def _build_action_buttons(self, parent):
         """Build center action buttons"""
-        button_frame = tk.Frame(parent, bg=self.app.card_bg)
+        button_frame = tk.Frame(parent, bg=self.theme.card_bg)
         button_frame.grid(row=0, column=1, sticky="", padx=20)
         
         self.run_query_btn = ttk.Button(
@@ -216,7 +230,7 @@ class MainUI:
 
     def build_database_explorer(self, parent):
         """Build database explorer component"""
-        self.database_explorer = DatabaseExplorer(parent, self.app)
+        self.database_explorer = DatabaseExplorer(parent, self.app, self.theme)
 
     def build_query_view(self, parent):
         """Build query editor and result viewer - Complete implementation from original"""
@@ -228,16 +242,47 @@ class MainUI:
         query_pane.grid(row=0, column=0, sticky="nsew")
 
         # Query editor
-        self.query_editor = QueryEditor(query_pane, self.app)
+        self.query_editor = QueryEditor(query_pane, self.app, self.theme)
 
         # Result viewer
-        self.result_viewer = ResultViewer(query_pane, self.app)
+        self.result_viewer = ResultViewer(query_pane, self.app, self.theme)
 
         # Adjusted weights for the vertical panels
         # The query editor is now larger and the result viewer is smaller.
         # Total parts = 8 + 2 = 10. Editor gets 8/10 (80%), results get 2/10 (20%).
         query_pane.add(self.query_editor.get_frame(), weight=8)
         query_pane.add(self.result_viewer.get_frame(), weight=2)
+        self._query_pane = query_pane
+
+    def _on_main_configure(self, event=None):
+        """Coalesce resize events into one sash update when Tk is idle"""
+        if self._layout_pending:
+            return
+        self._layout_pending = True
+        self.root.after_idle(self._apply_sash_positions)
+
+    def _apply_sash_positions(self):
+        """Move the sashes to their cached fractions after the window size changed"""
+        self._layout_pending = False
+        size = (self._paned.winfo_width(), self._query_pane.winfo_height())
+        if size == self._layout_size or size[0] <= 1 or size[1] <= 1:
+            return
+        self._layout_size = size
+        if self._sash_fractions is None:
+            self._capture_sash_fractions()
+            return
+        left_fraction, editor_fraction = self._sash_fractions
+        self._paned.sashpos(0, int(size[0] * left_fraction))
+        self._query_pane.sashpos(0, int(size[1] * editor_fraction))
+
+    def _capture_sash_fractions(self, event=None):
+        """Remember where the sashes are, e.g. after the user dragged one"""
+        width, height = self._paned.winfo_width(), self._query_pane.winfo_height()
+        if width > 1 and height > 1:
+            self._sash_fractions = (
+                self._paned.sashpos(0) / width,
+                self._query_pane.sashpos(0) / height
+            )
 
     def _execute_query(self):
         """Execute query through app controller"""
@@ -253,23 +298,12 @@ class MainUI:
                 messagebox.showwarning("No Results", "No query results to export. Please execute a query first.")
                 return
             
-            # Get current results content
-            results_content = self.result_viewer.get_results_content()
-            
-            if not results_content:
-                messagebox.showwarning("No Results", "No query results to export.")
-                return
-            
-            # Get current query for filename generation
+            # Current query goes into the export header
             current_query = self.query_editor.get_query().strip() if self.query_editor else ""
             
-            # Generate default filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            if current_query:
-                query_hash = hashlib.md5(current_query.encode()).hexdigest()[:8]
-                default_filename = f"SQLResults_{timestamp}_{query_hash}.log"
-            else:
-                default_filename = f"SQLResults_{timestamp}.log"
+            # Generate default filename; millisecond precision keeps exports apart
+            now = datetime.now()
+            default_filename = f"SQLResults_{now.strftime('%Y%m%d_%H%M%S_%f')[:-3]}.log"
             
             # Ask user for save location
             filepath = filedialog.asksaveasfilename(
@@ -282,32 +316,56 @@ class MainUI:
             if not filepath:
                 return
             
-            # Create export content with header
+            # Create export header and footer; the results are streamed in between
             server_info = self.app.get_current_server_info()
-            export_content = f"SQL Tool Query Results Export\n"
-            export_content += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            ts_human = now.strftime('%Y-%m-%d %H:%M:%S')
+            parts = [
+                "SQL Tool Query Results Export\n",
+                f"Generated: {ts_human}\n",
+            ]
             
             if server_info:
-                export_content += f"Server: {server_info.get('server', 'Unknown')}\n"
-                export_content += f"User: {server_info.get('username', 'Unknown')}\n"
+                parts.append(f"Server: {server_info.get('server', 'Unknown')}\n")
+                parts.append(f"User: {server_info.get('username', 'Unknown')}\n")
             
             if current_query:
-                export_content += f"\nQuery:\n{current_query}\n"
-            
-            export_content += f"\n{'='*80}\n"
-            export_content += f"RESULTS:\n\n{results_content}\n"
-            export_content += f"\n{'='*80}\n"
-            export_content += f"Export completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                parts.append(f"\nQuery:\n{current_query}\n")
             
-            # Save the file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(export_content)
+            parts.append(f"\n{'='*80}\n")
+            parts.append("RESULTS:\n\n")
+            header = "".join(parts)
+            footer = f"\n\n{'='*80}\nExport completed at {ts_human}\n"
             
-            messagebox.showinfo("Export Successful", f"Results exported successfully to:\n{filepath}")
+            # The widget can only be read on the Tk thread; the disk write happens on the pool
+            chunks = list(self.result_viewer.iter_results_content())
+            self.save_log_btn.config(state="disabled")
+            self.app.executor.submit(self._export_worker, filepath, header, chunks, footer)
             
         except Exception as e:
             messagebox.showerror("Export Failed", f"Failed to export results:\n{str(e)}")
 
+    def _export_worker(self, filepath, header, chunks, footer):
+        """Write an export file on a worker thread and report back on the Tk thread"""
+        try:
+            # Buffered chunk writes, never joining the results into one string
+            with open(filepath, 'w', encoding='utf-8', buffering=self.EXPORT_BUFFER_SIZE) as f:
+                f.write(header)
+                f.writelines(chunks)
+                f.write(footer)
+        except Exception as e:
+            self.root.after(0, self._export_finished, False, f"Failed to export results:\n{str(e)}")
+        else:
+            self.root.after(0, self._export_finished, True, f"Results exported successfully to:\n{filepath}")
+
+    def _export_finished(self, success, message):
+        """Re-enable exporting and tell the user how the export went"""
+        if not self.app.query_running:
+            self.save_log_btn.config(state="normal")
+        if success:
+            messagebox.showinfo("Export Successful", message)
+        else:
+            messagebox.showerror("Export Failed", message)
+
     # --- Methods below are for state management and delegation ---
     
     def set_query_running_state(self, is_running):
@@ -399,42 +457,30 @@ class MainUI:
         return {}
 
     def refresh_connection_status(self):
-        """Refresh connection status display - IMPROVED VERSION"""
+        """Schedule a connection status refresh; bursts collapse into one update"""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.root.after_idle(self._do_refresh_status)
+
+    def _do_refresh_status(self):
+        """Refresh connection status display"""
+        self._refresh_pending = False
         try:
-            # Just rebuild the connection status section instead of destroying the entire header
-            if hasattr(self, 'connection_status_frame') and self.connection_status_frame:
-                # Find the parent of connection_status_frame (should be header_frame)
-                header_frame = self.connection_status_frame.master
-                if header_frame:
-                    self._build_connection_status(header_frame)
-        except Exception as e:
+            if self.connection_status_frame is not None:
+                self._build_connection_status(self.connection_status_frame.master)
+        except tk.TclError as e:
             print(f"Error refreshing connection status: {e}")
-            # Fallback: rebuild entire header if needed
-            try:
-                self.build_main_ui_header()
-            except Exception as fallback_error:
-                print(f"Fallback header rebuild also failed: {fallback_error}")
 
     def update_connection_info(self, server, username):
-        """Update connection info display directly - NEW METHOD"""
+        """Update connection info display directly"""
         try:
-            if hasattr(self, 'server_label') and self.server_label:
-                self.server_label.config(text=server)
-            if hasattr(self, 'username_label') and self.username_label:
-                self.username_label.config(text=f"{username} ")
-        except Exception as e:
+            if self.connection_status_frame is not None:
+                self._update_connection_status({'server': server, 'username': username})
+        except tk.TclError as e:
             print(f"Error updating connection info: {e}")
-            # Rebuild the connection status if direct update fails
-            self.refresh_connection_status()
 
     def set_connection_info(self, server_info):
-        """Set connection information for display - NEW METHOD"""
-        if hasattr(self.app, 'current_server_info'):
-            self.app.current_server_info = server_info
-        else:
-            # Store it directly in app controller
-            self.app.connection_details = server_info
-        
-        # Update the display
+        """Set connection information for display"""
         if server_info and server_info.get('server') and server_info.get('username'):
-            self.update_connection_info(server_info['server'], server_info['username'])
\ No newline at end of file
+            self.update_connection_info(server_info['server'], server_info['username'])
@@ -2,9 +2,10 @@ import tkinter as tk
 from tkinter import scrolledtext
 
 class QueryEditor:
-    def __init__(self, parent, app_controller):
+    def __init__(self, parent, app_controller, theme):
         self.parent = parent
         self.app = app_controller
+        self.theme = theme
         self.query_text = None
         self.query_editor_frame = None
         self.build_editor()
@@ -14,16 +15,16 @@ class QueryEditor:
         # Query editor with modern styling - Made larger
         self.query_editor_frame = tk.Frame(
             self.parent, 
-            bg=self.app.card_bg, 
+            bg=self.theme.card_bg, 
             relief="solid", 
             bd=1,
-            highlightbackground=self.app.border_color, 
+            highlightbackground=self.theme.border_color, 
             highlightthickness=1
         )
         
         query_editor_container = tk.Frame(
             self.query_editor_frame, 
-            bg=self.app.card_bg, 
+            bg=self.theme.card_bg, 
             padx=12, 
             pady=12
         )
@@ -32,7 +33,7 @@ class QueryEditor:
         # Editor header
         editor_header = tk.Frame(
             query_editor_container, 
-            bg=self.app.light_gray, 
+            bg=self.theme.light_gray, 
             relief="solid", 
             bd=1
         )
@@ -42,8 +43,8 @@ class QueryEditor:
             editor_header,
             text="💻 Query Editor (Ctrl+Enter to execute)",
             font=('Segoe UI', 11, 'bold'),
-            bg=self.app.light_gray,
-            fg=self.app.primary_color,
+            bg=self.theme.light_gray,
+            fg=self.theme.primary_color,
             pady=8
         )
         editor_title.pack(anchor="w", padx=12)
@@ -63,7 +64,7 @@ class QueryEditor:
             insertbackground="#2c3e50",
             relief="solid",
             bd=1,
-            highlightbackground=self.app.border_color,
+            highlightbackground=self.theme.border_color,
             highlightthickness=1,
             padx=8,
             pady=8
@@ -1,29 +1,101 @@
+import io
+import queue
+import re
+import threading
 import tkinter as tk
+from itertools import chain, zip_longest
 from tkinter import scrolledtext
+from app.core.config import AppConfig
+
+try:
+    import numpy as np
+except ImportError:  # Optional; only speeds up widths of large tables
+    np = None
+
+# Characters outside the Basic Multilingual Plane
+_ASTRAL_RE = re.compile('[\U00010000-\U0010FFFF]')
+
+def _common_prefix_len(a, b):
+    """Length of the common prefix, found by bisecting with C-level slice compares"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
 
 class ResultViewer:
-    def __init__(self, parent, app_controller):
+    # Lines read from the text widget per chunk when streaming its content
+    CONTENT_CHUNK_LINES = 2000
+    # Buffered output is written immediately once it grows past this many characters
+    FLUSH_THRESHOLD = 65536
+    # Delay before queued output is drawn, so bursts land in one insert
+    DRAIN_INTERVAL_MS = 30
+    # Keys that still work while the results are read-only
+    READ_ONLY_KEYS = frozenset((
+        "Left", "Right", "Up", "Down", "Home", "End", "Prior", "Next",
+        "Shift_L", "Shift_R", "Control_L", "Control_R",
+    ))
+    CONTROL_MASK = 0x0004
+    # Insert cursor width while editing is enabled; hidden (0) while read-only
+    EDIT_CURSOR_WIDTH = 2
+    # Separator lines used on every query, built once
+    _DEFAULT_SEP = "-" * 80 + "\n"
+    _EQ_SEP = "=" * 80 + "\n"
+    # Tables with more cells than this compute column widths with NumPy when available
+    NUMPY_MIN_CELLS = 5000
+
+    def __init__(self, parent, app_controller, theme):
         self.parent = parent
         self.app = app_controller
-        self.result_text = None
+        self.theme = theme
+        # Widgets are created on first use, see _ensure_built
+        self._result_text = None
         self.result_viewer_frame = None
-        self.build_viewer()
+        # Appended text waiting to be inserted with a single Tk call; any thread may write
+        self._pending = queue.SimpleQueue()
+        self._pending_len = 0
+        self._flush_scheduled = False
+        self._read_only = True
+        # Match length variable shared by every find_text call
+        self._find_count = None
+        self._scroll_when_visible = False
+        # Scrollback limit; older lines are dropped as new output arrives
+        self.max_lines = AppConfig.LAYOUT['result_viewer_max_lines']
+        # Size of the widget's content, kept up to date on every change
+        self._line_count = 1
+        self._char_count = 0
+        # Lines dropped by the scrollback limit since the last clear
+        self._trimmed_lines = 0
+
+    @property
+    def result_text(self):
+        """The results Text widget, built on first access"""
+        self._ensure_built()
+        return self._result_text
+
+    def _ensure_built(self):
+        """Build the viewer widgets if that has not happened yet; Tk thread only"""
+        if self.result_viewer_frame is None:
+            self.build_viewer()
 
     def build_viewer(self):
         """Build result viewer with dark theme from original code"""
         # Result viewer frame with dark theme - Made smaller
         self.result_viewer_frame = tk.Frame(
             self.parent, 
-            bg=self.app.card_bg, 
+            bg=self.theme.card_bg, 
             relief="solid", 
             bd=1,
-            highlightbackground=self.app.border_color, 
+            highlightbackground=self.theme.border_color, 
             highlightthickness=1
         )
         
         result_viewer_container = tk.Frame(
             self.result_viewer_frame, 
-            bg=self.app.card_bg, 
+            bg=self.theme.card_bg, 
             padx=12, 
             pady=12
         )
@@ -32,7 +104,7 @@ class ResultViewer:
         # Results header with dark theme
         results_header = tk.Frame(
             result_viewer_container, 
-            bg=self.app.dark_bg, 
+            bg=self.theme.dark_bg, 
             relief="solid", 
             bd=1
         )
@@ -42,14 +114,14 @@ class ResultViewer:
             results_header,
             text="Query Results & Output Console",
             font=('Segoe UI', 11, 'bold'),
-            bg=self.app.dark_bg,
+            bg=self.theme.dark_bg,
             fg="white",
             pady=8
         )
         results_title.pack(anchor="w", padx=12)
         
         # Result text area with dark theme
-        self.result_text = scrolledtext.ScrolledText(
+        self._result_text = scrolledtext.ScrolledText(
             result_viewer_container, 
             wrap=tk.NONE, 
             height=10,  # Reduced height
@@ -60,92 +132,236 @@ class ResultViewer:
             selectforeground="white",
             relief="solid",
             bd=1,
-            highlightbackground=self.app.border_color,
+            highlightbackground=self.theme.border_color,
             highlightthickness=1,
-            state="disabled",
             padx=8,
-            pady=8
+            pady=8,
+            # Output console: no undo history or cursor blinking to maintain on each insert,
+            # and no visible cursor while read-only
+            undo=False,
+            autoseparators=False,
+            maxundo=0,
+            blockcursor=False,
+            insertofftime=0,
+            insertwidth=0 if self._read_only else self.EDIT_CURSOR_WIDTH
         )
         self.result_text.pack(fill="both", expand=True)
+        self.result_text.tag_config("highlight", background="yellow", foreground="black")
+        self.result_text.tag_config("trim_marker", foreground="#9e9e9e")
+
+        # The widget stays in state "normal" so writes need no state toggling;
+        # user edits are swallowed by these bindings instead
+        self.result_text.bind("<Key>", self._block_key)
+        for sequence in ("<<Paste>>", "<<Cut>>", "<<Clear>>", "<Button-2>"):
+            self.result_text.bind(sequence, self._block_edit)
+        # <Visibility> also fires when a hidden ancestor is shown again, unlike <Map>
+        self.result_text.bind("<Visibility>", self._on_visible)
+
+    def _block_key(self, event):
+        """Let navigation and copy keys through while the text is read-only"""
+        if not self._read_only or event.keysym in self.READ_ONLY_KEYS:
+            return None
+        if event.state & self.CONTROL_MASK and event.keysym.lower() in ("c", "a"):
+            return None
+        return "break"
+
+    def _block_edit(self, event):
+        return "break" if self._read_only else None
+
+    def _on_visible(self, event):
+        """Catch up on the scroll skipped while the widget was hidden"""
+        if self._scroll_when_visible and self.result_text.winfo_viewable():
+            self._scroll_when_visible = False
+            self.result_text.see(tk.END)
+
+    def _write(self, text):
+        """Queue text for the end of the results area; safe to call from worker threads"""
+        self._pending.put(text)
+        self._pending_len += len(text)
+        if self._pending_len > self.FLUSH_THRESHOLD and threading.current_thread() is threading.main_thread():
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.parent.after(self.DRAIN_INTERVAL_MS, self._flush)
+
+    def _take_pending(self):
+        """Empty the queue, returning the texts in write order"""
+        parts = []
+        try:
+            while True:
+                parts.append(self._pending.get_nowait())
+        except queue.Empty:
+            pass
+        self._pending_len = 0
+        return parts
+
+    def _flush(self):
+        """Insert all queued text with one insert and one scroll"""
+        # Reset before draining: a write racing with the drain either lands in
+        # this batch or schedules the next one
+        self._flush_scheduled = False
+        parts = self._take_pending()
+        if not parts:
+            return
+        text = "".join(parts)
+        # Only follow new output if the user has not scrolled up to read earlier lines
+        at_bottom = self.result_text.yview()[1] >= 0.999
+        self.result_text.insert(tk.END, text)
+        self._count_inserted(text)
+        if self.max_lines and self._line_count > self.max_lines:
+            self._trim()
+        if at_bottom or self._scroll_when_visible:
+            # Scrolling a hidden widget is wasted layout work; do it once it is shown
+            # again, or on the first flush that finds it viewable
+            if self.result_text.winfo_viewable():
+                self._scroll_when_visible = False
+                self.result_text.see(tk.END)
+            else:
+                self._scroll_when_visible = True
+
+    def _trim(self):
+        """Drop the oldest output beyond max_lines, behind a line saying how much went
+
+        Export and copy read the widget, so the marker also tells their reader
+        that the text is incomplete.
+        """
+        text = self.result_text
+        over = self._line_count - self.max_lines
+        marker = text.tag_ranges("trim_marker")
+        if marker:
+            # Output starts right after the marker line
+            start = text.index(marker[1])
+            removed = over
+        else:
+            # Make room for the marker line itself
+            start = "1.0"
+            removed = over + 1
+        end = f"{start} + {removed} lines"
+        # Measured with len() like every other count update; Tk counts characters
+        # outside the BMP (the emoji in the output) differently
+        self._char_count -= len(text.get(start, end))
+        text.delete(start, end)
+        if marker:
+            self._char_count -= len(text.get(*marker))
+            text.delete(*marker)
+        self._trimmed_lines += removed
+        note = (f"··· {self._trimmed_lines:,} earlier lines trimmed "
+                f"(display limit {self.max_lines:,} lines) ···\n")
+        text.insert(marker[0] if marker else "1.0", note, "trim_marker")
+        self._char_count += len(note)
+        self._line_count = self.max_lines
+
+    def _count_inserted(self, text):
+        self._char_count += len(text)
+        self._line_count += text.count("\n")
+
+    def _reset_counts(self, text=""):
+        self._char_count = 0
+        self._line_count = 1
+        self._trimmed_lines = 0
+        self._count_inserted(text)
+
+    def _count(self, start, end, unit="lines"):
+        """Number of lines (or other Tk count unit) between two indices, counted by Tk's B-tree"""
+        count = self.result_text.count(start, end, unit)
+        # Older tkinter returns a 1-tuple, or None for zero
+        if isinstance(count, tuple):
+            count = count[0]
+        return count or 0
+
+    def _discard_pending(self):
+        """Drop queued text that has not been inserted yet"""
+        self._take_pending()
 
     def clear_results(self):
         """Clear the results text area"""
-        self.result_text.config(state="normal")
+        self._discard_pending()
         self.result_text.delete("1.0", tk.END)
-        self.result_text.config(state="disabled")
+        self._reset_counts()
 
     def append_result(self, result):
         """Append result to display"""
-        self.result_text.config(state="normal")
-        self.result_text.insert(tk.END, result)
-        self.result_text.config(state="disabled")
-        # Auto-scroll to bottom to show latest results
-        self.result_text.see(tk.END)
+        self._write(result)
 
     def show_execution_summary(self, summary):
-        """Display the detailed execution summary at the top (from original)"""
-        self.result_text.config(state="normal")
-        self.result_text.delete("1.0", tk.END)  # Clear previous content
-        self.result_text.insert(tk.END, summary + "\n")
-        self.result_text.config(state="disabled")
+        """Display the detailed execution summary at the top, above streamed results"""
+        self._flush()
+        self.result_text.insert("1.0", summary + "\n")
+        self._count_inserted(summary + "\n")
         self.result_text.see("1.0")  # Scroll to top to show summary
 
     def show_status(self, status_message):
         """Show status message in results area"""
-        self.result_text.config(state="normal")
-        self.result_text.insert(tk.END, f"{status_message}\n")
-        self.result_text.config(state="disabled")
-        self.result_text.see(tk.END)
+        self._write(f"{status_message}\n")
 
     def show_error(self, error_message):
         """Show error message in results area"""
-        self.result_text.config(state="normal")
-        self.result_text.insert(tk.END, f"ERROR: {error_message}\n")
-        self.result_text.config(state="disabled")
-        self.result_text.see(tk.END)
+        self._write(f"ERROR: {error_message}\n")
 
     def get_frame(self):
         """Return the main frame for packing"""
+        self._ensure_built()
         return self.result_viewer_frame
 
     def is_empty(self):
         """Check if result viewer is empty"""
+        self._flush()
         content = self.result_text.get("1.0", tk.END).strip()
         return len(content) == 0
 
     def get_results_content(self):
         """Get the current content of the results text area"""
+        self._flush()
         try:
             return self.result_text.get("1.0", tk.END).strip()
         except Exception:
             return ""
 
+    def iter_results_content(self):
+        """Yield the results text in blocks of lines instead of one full copy"""
+        self._flush()
+        last_line = self._count("1.0", "end-1c") + 1
+        for start in range(1, last_line + 1, self.CONTENT_CHUNK_LINES):
+            end = start + self.CONTENT_CHUNK_LINES
+            yield self.result_text.get(f"{start}.0", f"{end}.0" if end <= last_line else "end-1c")
+
     def insert_text(self, text, position="end"):
         """Insert text at specified position"""
-        self.result_text.config(state="normal")
+        self._flush()
         if position == "end":
             self.result_text.insert(tk.END, text)
         elif position == "start":
             self.result_text.insert("1.0", text)
         else:
             self.result_text.insert(position, text)
-        self.result_text.config(state="disabled")
+        self._count_inserted(text)
         self.result_text.see(tk.END)
 
     def replace_content(self, new_content):
-        """Replace all content in the results area"""
-        self.result_text.config(state="normal")
-        self.result_text.delete("1.0", tk.END)
-        self.result_text.insert("1.0", new_content)
-        self.result_text.config(state="disabled")
+        """Replace all content in the results area, touching only the part that changed"""
+        self._discard_pending()
+        current = self.result_text.get("1.0", "end-1c")
+        if current == new_content:
+            return
+        if _ASTRAL_RE.search(current) or _ASTRAL_RE.search(new_content):
+            # Tk counts characters outside the BMP differently from Python; replace everything
+            prefix = suffix = 0
+        else:
+            prefix = _common_prefix_len(current, new_content)
+            limit = min(len(current), len(new_content)) - prefix
+            suffix = _common_prefix_len(current[::-1][:limit], new_content[::-1][:limit])
+        start = f"1.0 + {prefix} chars"
+        self.result_text.delete(start, f"end-1c - {suffix} chars")
+        self.result_text.insert(start, new_content[prefix:len(new_content) - suffix])
+        # Whatever survived of an old trim marker is ordinary text now
+        self.result_text.tag_remove("trim_marker", "1.0", tk.END)
+        self._reset_counts(new_content)
         self.result_text.see("1.0")
 
     def get_selected_text(self):
         """Get currently selected text"""
-        try:
-            return self.result_text.selection_get()
-        except tk.TclError:
-            return ""
+        ranges = self.result_text.tag_ranges("sel")
+        return self.result_text.get(ranges[0], ranges[1]) if ranges else ""
 
     def scroll_to_top(self):
         """Scroll to the top of the results"""
@@ -171,34 +387,42 @@ class ResultViewer:
 
     def enable_editing(self):
         """Enable text editing (make text area editable)"""
-        self.result_text.config(state="normal")
+        self._read_only = False
+        self.result_text.config(insertwidth=self.EDIT_CURSOR_WIDTH)
 
     def disable_editing(self):
         """Disable text editing (make text area read-only)"""
-        self.result_text.config(state="disabled")
+        self._read_only = True
+        self.result_text.config(insertwidth=0)
 
     def copy_to_clipboard(self):
         """Copy all results to clipboard"""
         try:
-            content = self.get_results_content()
-            if content:
-                self.root.clipboard_clear()
-                self.root.clipboard_append(content)
-                return True
-            return False
-        except Exception:
+            if not self.get_character_count():
+                return False
+            # One copy straight from the widget; "end-1c" drops Tk's trailing newline
+            self.result_text.clipboard_clear()
+            self.result_text.clipboard_append(self.result_text.get("1.0", "end-1c"))
+            return True
+        except tk.TclError:
             return False
 
-    def find_text(self, search_text, start_pos="1.0"):
+    def find_text(self, search_text, start_pos="1.0", nocase=False, regexp=False):
         """Find text in results and return position"""
+        self._flush()
         try:
-            pos = self.result_text.search(search_text, start_pos, tk.END)
+            # Tk reports the match length, which differs from len(search_text) for regexps
+            if self._find_count is None:
+                self._find_count = tk.IntVar(master=self.result_text)
+            pos = self.result_text.search(
+                search_text, start_pos, tk.END,
+                count=self._find_count, nocase=nocase, regexp=regexp
+            )
             if pos:
                 # Highlight the found text
-                end_pos = f"{pos}+{len(search_text)}c"
+                end_pos = f"{pos}+{self._find_count.get()}c"
                 self.result_text.tag_remove("highlight", "1.0", tk.END)
                 self.result_text.tag_add("highlight", pos, end_pos)
-                self.result_text.tag_config("highlight", background="yellow", foreground="black")
                 self.result_text.see(pos)
                 return pos
             return None
@@ -214,18 +438,13 @@ class ResultViewer:
 
     def get_line_count(self):
         """Get the number of lines in the results"""
-        try:
-            return int(self.result_text.index(tk.END).split('.')[0]) - 1
-        except Exception:
-            return 0
+        self._flush()
+        return self._line_count
 
     def get_character_count(self):
         """Get the number of characters in the results"""
-        try:
-            content = self.get_results_content()
-            return len(content)
-        except Exception:
-            return 0
+        self._flush()
+        return self._char_count
 
     def set_wrap_mode(self, wrap_mode=tk.NONE):
         """Set text wrapping mode (tk.NONE, tk.CHAR, tk.WORD)"""
@@ -233,59 +452,64 @@ class ResultViewer:
 
     def show_info(self, info_message):
         """Show info message in results area with INFO prefix"""
-        self.result_text.config(state="normal")
-        self.result_text.insert(tk.END, f"INFO: {info_message}\n")
-        self.result_text.config(state="disabled")
-        self.result_text.see(tk.END)
+        self._write(f"INFO: {info_message}\n")
 
     def show_warning(self, warning_message):
         """Show warning message in results area with WARNING prefix"""
-        self.result_text.config(state="normal")
-        self.result_text.insert(tk.END, f"WARNING: {warning_message}\n")
-        self.result_text.config(state="disabled")
-        self.result_text.see(tk.END)
+        self._write(f"WARNING: {warning_message}\n")
 
     def append_separator(self, char="-", length=80):
         """Append a separator line to results"""
-        separator = char * length + "\n"
+        if char == "-" and length == 80:
+            separator = self._DEFAULT_SEP
+        else:
+            separator = char * length + "\n"
         self.append_result(separator)
 
     def format_table_result(self, headers, rows, table_name=""):
         """Format and display tabular data in a readable format"""
         try:
-            self.result_text.config(state="normal")
-            
+            # Everything for this table is accumulated here and written once
+            buf = io.StringIO()
             if table_name:
-                self.result_text.insert(tk.END, f"\n=== {table_name} ===\n")
+                buf.write(f"\n=== {table_name} ===\n")
             
             if headers and rows:
-                # Calculate column widths
-                col_widths = []
-                for i, header in enumerate(headers):
-                    max_width = len(str(header))
-                    for row in rows:
-                        if i < len(row):
-                            max_width = max(max_width, len(str(row[i])))
-                    col_widths.append(min(max_width + 2, 50))  # Cap at 50 chars
-                
-                # Print headers
-                header_line = "|".join(str(header).ljust(col_widths[i]) for i, header in enumerate(headers))
-                self.result_text.insert(tk.END, header_line + "\n")
-                
-                # Print separator
-                separator_line = "|".join("-" * col_widths[i] for i in range(len(headers)))
-                self.result_text.insert(tk.END, separator_line + "\n")
+                # Stringify every cell once; extra cells beyond the headers are not shown
+                column_count = len(headers)
+                str_headers = [str(header) for header in headers]
+                str_rows = [[str(cell) for cell in row[:column_count]] for row in rows]
+                # Short rows are filled up front so the loops below need no bounds checks
+                for row in str_rows:
+                    if len(row) < column_count:
+                        row.extend([""] * (column_count - len(row)))
                 
-                # Print rows
-                for row in rows:
-                    row_line = "|".join(str(row[i] if i < len(row) else "").ljust(col_widths[i]) 
-                                       for i in range(len(headers)))
-                    self.result_text.insert(tk.END, row_line + "\n")
+                # Calculate column widths in one pass over the columns
+                if np is not None and len(str_rows) * column_count > self.NUMPY_MIN_CELLS:
+                    lengths = np.fromiter(
+                        map(len, chain.from_iterable(str_rows)),
+                        dtype=np.int64, count=len(str_rows) * column_count
+                    ).reshape(-1, column_count).max(axis=0)
+                    col_widths = [
+                        min(max(len(header), int(length)) + 2, 50)  # Cap at 50 chars
+                        for header, length in zip(str_headers, lengths)
+                    ]
+                else:
+                    col_widths = [
+                        min(max(map(len, column)) + 2, 50)  # Cap at 50 chars
+                        for column in zip_longest(str_headers, *str_rows, fillvalue="")
+                    ]
                 
-                self.result_text.insert(tk.END, f"\nRows returned: {len(rows)}\n\n")
+                separator_line = "|".join(["-" * width for width in col_widths])
+                for i, row in enumerate((str_headers, *str_rows)):
+                    buf.write("|".join([cell.ljust(width) for cell, width in zip(row, col_widths)]))
+                    buf.write("\n")
+                    if i == 0:
+                        buf.write(separator_line + "\n")
+                buf.write(f"\nRows returned: {len(rows)}\n\n")
             
-            self.result_text.config(state="disabled")
-            self.result_text.see(tk.END)
+            if buf.tell():
+                self._write(buf.getvalue())
             
         except Exception as e:
             self.show_error(f"Error formatting table: {str(e)}")
@@ -298,8 +522,7 @@ class ResultViewer:
             if query:
                 query_preview = query[:50] + "..." if len(query) > 50 else query
                 timing_info += f" - Query: {query_preview}"
-            timing_info += "\n" + "="*80 + "\n"
-            self.append_result(timing_info)
+            self.append_result(timing_info + "\n" + self._EQ_SEP)
         except Exception as e:
             self.show_error(f"Error showing timing: {str(e)}")
 
@@ -321,12 +544,4 @@ class ResultViewer:
 
     def export_to_clipboard(self):
         """Export current results to clipboard"""
-        try:
-            content = self.get_results_content()
-            if content:
-                self.result_text.clipboard_clear()
-                self.result_text.clipboard_append(content)
-                return True
-            return False
-        except Exception:
-            return False
\ No newline at end of file
+        return self.copy_to_clipboard()
\ No newline at end of file
@@ -2,16 +2,17 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 class HistoryDialog:
-    def __init__(self, parent, app_controller):
+    def __init__(self, parent, app_controller, theme):
         self.parent = parent
         self.app = app_controller
+        self.theme = theme
         self.window = None
 
     def show_history(self):
         """Show complete query history dialog with modern styling - Complete implementation from original"""
-        history = self.app.get_query_history()
+        history = self.app.history_manager
         
-        if not history:
+        if not len(history):
             messagebox.showinfo("History", "No query history yet.")
             return
             
@@ -19,7 +20,7 @@ class HistoryDialog:
         self.window = tk.Toplevel(self.parent)
         self.window.title("Query History")
         self.window.geometry("700x500")
-        self.window.configure(bg=self.app.bg_color)
+        self.window.configure(bg=self.theme.bg_color)
         
         # Make window modal
         self.window.transient(self.parent)
@@ -57,29 +58,29 @@ class HistoryDialog:
 
     def _build_header(self):
         """Build modern header from original code"""
-        header_frame = tk.Frame(self.window, bg=self.app.card_bg, pady=15)
+        header_frame = tk.Frame(self.window, bg=self.theme.card_bg, pady=15)
         header_frame.pack(fill="x", padx=10, pady=(10, 5))
         
         tk.Label(
             header_frame, 
             text="📜 Query History", 
-            font=self.app.font_subtitle,
-            bg=self.app.card_bg,
-            fg=self.app.primary_color
+            font=self.theme.font_subtitle,
+            bg=self.theme.card_bg,
+            fg=self.theme.primary_color
         ).pack(side="left")
         
         tk.Label(
             header_frame, 
             text="Double-click to load a query", 
-            font=self.app.font_small,
-            bg=self.app.card_bg,
-            fg=self.app.muted_color
+            font=self.theme.font_small,
+            bg=self.theme.card_bg,
+            fg=self.theme.muted_color
         ).pack(side="right")
 
     def _build_history_list(self, history):
         """Build history listbox with modern styling from original code"""
         # History listbox with modern styling
-        list_frame = tk.Frame(self.window, bg=self.app.bg_color)
+        list_frame = tk.Frame(self.window, bg=self.theme.bg_color)
         list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
         
         # Create listbox with scrollbar
@@ -88,9 +89,9 @@ class HistoryDialog:
             width=80, 
             height=20, 
             font=('Consolas', 11),
-            bg=self.app.card_bg,
-            fg=self.app.primary_color,
-            selectbackground=self.app.accent_color,
+            bg=self.theme.card_bg,
+            fg=self.theme.primary_color,
+            selectbackground=self.theme.accent_color,
             selectforeground="white"
         )
         
@@ -100,10 +101,8 @@ class HistoryDialog:
         self.listbox.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Populate history (reversed to show newest first)
-        for dt, q in reversed(history):
-            preview = q if len(q) <= 60 else q[:57] + "..."
-            self.listbox.insert(tk.END, f"{dt:%Y-%m-%d %H:%M:%S}: {preview}")
+        # Populate history (newest first)
+        self._insert_entries(history)
         
         # Bind double-click event
         self.listbox.bind("<Double-Button-1>", self._on_double_click)
@@ -115,9 +114,15 @@ class HistoryDialog:
         # Build button frame
         self._build_buttons()
 
+    def _insert_entries(self, history):
+        """Fill the listbox from the history manager, newest first"""
+        for dt, q in history.iter_newest_first():
+            preview = q if len(q) <= 60 else q[:57] + "..."
+            self.listbox.insert(tk.END, f"{dt:%Y-%m-%d %H:%M:%S}: {preview}")
+
     def _build_buttons(self):
         """Build button frame with Load and Close buttons"""
-        button_frame = tk.Frame(self.window, bg=self.app.bg_color, pady=10)
+        button_frame = tk.Frame(self.window, bg=self.theme.bg_color, pady=10)
         button_frame.pack(fill="x", padx=10)
         
         # Load button
@@ -164,11 +169,10 @@ class HistoryDialog:
         """Load selected query into editor - Complete logic from original"""
         selection = self.listbox.curselection()
         if selection:
-            history = self.app.get_query_history()
             selected_index = selection[0]
             
             # Get the query (remember history is reversed in display)
-            _, query = history[-(selected_index + 1)]
+            _, query = self.app.history_manager.get_entry(-(selected_index + 1))
             
             # Load query into editor through app controller
             self.app.load_query_from_history(query)
@@ -186,14 +190,9 @@ class HistoryDialog:
         # Confirm deletion
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete the selected query from history?"):
             selected_index = selection[0]
-            history = self.app.get_query_history()
-            
-            # Remove from history (remember history is reversed in display)
-            actual_index = len(history) - 1 - selected_index
-            history.pop(actual_index)
             
-            # Save updated history
-            self.app.history_manager.save_history()
+            # Remove and persist (remember history is reversed in display)
+            self.app.history_manager.remove_query(-(selected_index + 1))
             
             # Refresh the list
             self._refresh_history_list()
@@ -210,11 +209,9 @@ class HistoryDialog:
         self.listbox.delete(0, tk.END)
         
         # Repopulate with updated history
-        history = self.app.get_query_history()
-        if history:
-            for dt, q in reversed(history):
-                preview = q if len(q) <= 60 else q[:57] + "..."
-                self.listbox.insert(tk.END, f"{dt:%Y-%m-%d %H:%M:%S}: {preview}")
+        history = self.app.history_manager
+        if len(history):
+            self._insert_entries(history)
         else:
             # Close dialog if no history left
             messagebox.showinfo("History Cleared", "All query history has been cleared.")
@@ -224,11 +221,11 @@ class HistoryDialog:
         """Get information about the selected query"""
         selection = self.listbox.curselection()
         if selection:
-            history = self.app.get_query_history()
+            history = self.app.history_manager
             selected_index = selection[0]
             actual_index = len(history) - 1 - selected_index
             
-            dt, query = history[actual_index]
+            dt, query = history.get_entry(actual_index)
             return {
                 'datetime': dt,
                 'query': query,
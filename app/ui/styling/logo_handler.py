@@ -1,19 +1,70 @@
+import io
 import os
+import tkinter as tk
 from PIL import Image, ImageTk
 
+LOGO_PATH = os.path.join("assets", "logo.png")
+
+# Decoded and resized images keyed by (absolute path, mtime, parameters...)
+_IMAGE_CACHE = {}
+
+def _load_logo_source():
+    """Read and decode the bundled logo once; None when it is missing or unreadable"""
+    try:
+        with open(LOGO_PATH, "rb") as f:
+            img = Image.open(io.BytesIO(f.read()))
+            img.load()
+            return img
+    except (OSError, Image.UnidentifiedImageError):
+        return None
+
+# Decoded at import so the login screen never touches the disk for it
+_LOGO_IMAGE = _load_logo_source()
+
 class LogoHandler:
+    @staticmethod
+    def _cached_image(path, params, build):
+        """Return the cached PhotoImage for path/params, building it on a miss"""
+        key = (os.path.abspath(path), os.path.getmtime(path)) + params
+        return LogoHandler._cached_by_key(key, build)
+
+    @staticmethod
+    def _cached_by_key(key, build):
+        image = _IMAGE_CACHE.get(key)
+        if image is not None:
+            try:
+                image.width()  # Fails once the owning Tk interpreter is gone
+                return image
+            except tk.TclError:
+                del _IMAGE_CACHE[key]
+        image = build()
+        if image is not None:
+            _IMAGE_CACHE[key] = image
+        return image
+
+    @staticmethod
+    def _thumbnail(path, size):
+        img = Image.open(path)
+        # Lets the JPEG decoder downscale while decoding; no-op for other formats
+        img.draft(img.mode, size)
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        return ImageTk.PhotoImage(img)
+
     @staticmethod
     def create_logo_placeholder():
         """Load the actual logo image from assets/logo.png - Complete logic from original"""
         try:
-            # Try to load the actual logo from assets folder
-            logo_path = os.path.join("assets", "logo.png")
-            if os.path.exists(logo_path):
-                # Load and resize the logo image
-                img = Image.open(logo_path)
-                # Resize to reasonable dimensions for the login page (max 120x60)
-                img.thumbnail((240, 120), Image.Resampling.LANCZOS)
-                return ImageTk.PhotoImage(img)
+            # Use the logo decoded from the assets folder at import
+            if _LOGO_IMAGE is not None:
+                # Resize to reasonable dimensions for the login page
+                size = (240, 120)
+
+                def build():
+                    img = _LOGO_IMAGE.copy()
+                    img.thumbnail(size, Image.Resampling.LANCZOS)
+                    return ImageTk.PhotoImage(img)
+
+                return LogoHandler._cached_by_key((LOGO_PATH, size), build)
             else:
                 # Fallback: create a simple colored rectangle as logo if file not found
                 img = Image.new('RGB', (80, 40), color='#3498db')
@@ -32,10 +83,10 @@ class LogoHandler:
         """Load and resize logo image from specified path"""
         try:
             if os.path.exists(path):
-                img = Image.open(path)
                 # Resize using thumbnail to maintain aspect ratio
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-                return ImageTk.PhotoImage(img)
+                return LogoHandler._cached_image(
+                    path, (size,), lambda: LogoHandler._thumbnail(path, size)
+                )
             else:
                 # Return fallback logo if path doesn't exist
                 return LogoHandler._create_fallback_logo(size)
@@ -57,7 +108,7 @@ class LogoHandler:
         """Load icon for window title bar"""
         try:
             if os.path.exists(path):
-                return ImageTk.PhotoImage(file=path)
+                return LogoHandler._cached_image(path, ("icon",), lambda: ImageTk.PhotoImage(file=path))
             else:
                 return None
         except:
@@ -97,8 +148,9 @@ class LogoHandler:
     @staticmethod
     def resize_image(image_path, new_size, maintain_aspect=True):
         """Resize an image to new dimensions"""
-        try:
+        def build():
             img = Image.open(image_path)
+            img.draft(img.mode, new_size)
             
             if maintain_aspect:
                 img.thumbnail(new_size, Image.Resampling.LANCZOS)
@@ -106,6 +158,9 @@ class LogoHandler:
                 img = img.resize(new_size, Image.Resampling.LANCZOS)
             
             return ImageTk.PhotoImage(img)
+
+        try:
+            return LogoHandler._cached_image(image_path, (tuple(new_size), maintain_aspect), build)
         except Exception as e:
             return None
 
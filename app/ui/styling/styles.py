@@ -1,7 +1,16 @@
 from tkinter import ttk
+import tkinter.font as tkfont
 from app.core.config import AppConfig
 
 class StyleManager:
+    # Button style name, background, hover and pressed colour keys, font key
+    BUTTON_STYLES = (
+        ('Accent', 'button_accent', 'button_accent_hover', 'button_accent_pressed', 'normal'),
+        ('Modern', 'button_modern', 'button_modern_hover', None, 'normal'),
+        ('Warning', 'button_warning', 'button_warning_hover', None, 'normal'),
+        ('Red', 'button_red', 'button_red_hover', None, 'bold'),
+    )
+
     def __init__(self, root, app_controller):
         self.root = root
         self.app = app_controller
@@ -22,6 +31,18 @@ class StyleManager:
         """Define font scheme from AppConfig"""
         # Fonts are already defined in AppConfig, just reference them
         self.fonts = AppConfig.FONTS
+        # Fonts used by many labels are registered once with Tk and referenced by name
+        # instead of having every widget parse the same font tuple
+        self.status_bold_font = self._named_font('SQLToolStatusBold', self.fonts['status_bold'])
+        self.logo_title_font = self._named_font('SQLToolLogoTitle', self.fonts['logo_title'])
+
+    def _named_font(self, name, spec):
+        """Create a named Tk font from a (family, size[, weight]) tuple"""
+        family, size, *style = spec
+        return tkfont.Font(
+            root=self.root, name=name, family=family, size=size,
+            weight='bold' if 'bold' in style else 'normal'
+        )
 
     def setup_styles(self):
         """Configure TTK styles - Complete implementation from original setup_style"""
@@ -42,54 +63,21 @@ class StyleManager:
 
     def _setup_button_styles(self):
         """Setup all button styles from original"""
-        # Accent button style
-        self.style.configure('Accent.TButton', 
-                           foreground='white', 
-                           background=self.colors['button_accent'],
-                           font=self.fonts['normal'],
-                           padding=(12, 8),
-                           borderwidth=0,
-                           relief='flat')
-        self.style.map('Accent.TButton',
-                      background=[('active', self.colors['button_accent_hover']), 
-                                ('pressed', self.colors['button_accent_pressed'])],
-                      foreground=[('active', 'white')])
-        
-        # Modern button style
-        self.style.configure('Modern.TButton', 
-                           foreground='white', 
-                           background=self.colors['button_modern'],
-                           font=self.fonts['normal'],
-                           padding=(12, 8),
-                           borderwidth=0,
-                           relief='flat')
-        self.style.map('Modern.TButton',
-                      background=[('active', self.colors['button_modern_hover'])],
-                      foreground=[('active', 'white')])
-        
-        # Warning button style
-        self.style.configure('Warning.TButton', 
-                           foreground='white', 
-                           background=self.colors['button_warning'],
-                           font=self.fonts['normal'],
-                           padding=(12, 8),
-                           borderwidth=0,
-                           relief='flat')
-        self.style.map('Warning.TButton',
-                      background=[('active', self.colors['button_warning_hover'])],
-                      foreground=[('active', 'white')])
-        
-        # Red button style
-        self.style.configure('Red.TButton', 
-                           foreground='white', 
-                           background=self.colors['button_red'],
-                           font=self.fonts['bold'],
-                           padding=(12, 8),
-                           borderwidth=0,
-                           relief='flat')
-        self.style.map('Red.TButton',
-                      background=[('active', self.colors['button_red_hover'])],
-                      foreground=[('active', 'white')])
+        for name, bg_key, active_key, pressed_key, font_key in self.BUTTON_STYLES:
+            style_name = f'{name}.TButton'
+            self.style.configure(style_name, 
+                               foreground='white', 
+                               background=self.colors[bg_key],
+                               font=self.fonts[font_key],
+                               padding=(12, 8),
+                               borderwidth=0,
+                               relief='flat')
+            background = [('active', self.colors[active_key])]
+            if pressed_key:
+                background.append(('pressed', self.colors[pressed_key]))
+            self.style.map(style_name,
+                          background=background,
+                          foreground=[('active', 'white')])
 
     def _setup_label_styles(self):
         """Setup label styles from original"""
@@ -1,21 +1,49 @@
+import csv
 import os
-import hashlib
+import re
+import time
 from datetime import datetime
-from tkinter import filedialog, messagebox
+
+from app.core.config import AppConfig
+
+# Characters Windows does not allow in file names
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+def _encode(text):
+    """UTF-8 bytes with platform line endings, as a text-mode file would write them"""
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode('utf-8')
+
+# Constant pieces of the query log, encoded once
+_SECTION_BREAK = _encode("-" * 80 + "\n\n")
+_QUERY_LABEL = _encode("QUERY:\n")
+_RESULTS_LABEL = _encode("RESULTS:\n")
+_FOOTER_RULE = _encode("\n" + "=" * 80 + "\n")
 
 class FileOperationsManager:
+    # With fsync enabled, buffered results are pushed to the OS every this many
+    LOG_FLUSH_EVERY = 32
+
     @staticmethod
-    def save_query_log(query_data, server_info):
-        """Complete save query log functionality from original code"""
+    def save_query_log(query_data, server_info, durable=None):
+        """Complete save query log functionality from original code
+
+        durable: fsync the log before returning; defaults to FILES['log_fsync'].
+        """
         if not query_data or not query_data.get('results'):
             return False, "No query results to save"
         
         try:
-            # Generate filename
-            query_hash = hashlib.md5(query_data['query'].encode()).hexdigest()[:8]
-            timestamp = query_data['start_time'].strftime("%Y%m%d_%H%M%S")
-            default_filename = f"SQLTool_{timestamp}_{query_hash}.log"
-            
+            # Generate filename; millisecond precision keeps runs apart
+            started = datetime.fromtimestamp(query_data.get('start_wall') or time.time())
+            # One strftime for both; the header shows the stamp without the fraction
+            stamp = started.strftime("%Y%m%d_%H%M%S_%f")
+            timestamp = stamp[:15]
+            default_filename = f"SQLTool_{stamp[:-3]}.log"
+            
+            # Tk is only loaded once a dialog is actually needed
+            from tkinter import filedialog
             # Ask user for save location
             filepath = filedialog.asksaveasfilename(
                 initialfile=default_filename,
@@ -26,38 +54,45 @@ class FileOperationsManager:
             if not filepath:
                 return False, "Save cancelled by user"
             
-            # Write the log file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                # Write header
-                f.write(f"SQL Tool Query Log - {timestamp}\n")
-                f.write(f"Executed on server: {server_info['server']}\n")
-                f.write(f"User: {server_info['username']}\n")
-                f.write("-" * 80 + "\n\n")
-                
-                # Write query
-                f.write("QUERY:\n")
-                f.write(query_data['query'])
-                f.write("\n\n")
-                
-                # Write execution info
-                f.write(f"Execution time: {query_data['exec_time']:.2f} seconds\n")
-                f.write(f"Total rows returned: {query_data['total_rows']}\n")
-                f.write(f"Databases queried: {', '.join(query_data['databases'])}\n")
-                f.write("-" * 80 + "\n\n")
-                
-                # Write results
-                f.write("RESULTS:\n")
-                for result in query_data['results']:
-                    f.write(f"\nDatabase: {result['database']}\n")
-                    if result['statement_num'] > 0:
-                        f.write(f"Query {result['statement_num']}:\n")
-                    if not result['success']:
-                        f.write(f"ERROR: {result['error']}\n")
-                    f.write(result['result'])
-                    f.write("\n")
-                
-                f.write("\n" + "=" * 80 + "\n")
-                f.write(f"Log generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            if durable is None:
+                durable = AppConfig.FILES['log_fsync']
+
+            # Header in one write; results are streamed so memory stays bounded
+            # Only the dynamic text is encoded per save
+            header = b"".join([
+                _encode(
+                    f"SQL Tool Query Log - {timestamp}\n"
+                    f"Executed on server: {server_info['server']}\n"
+                    f"User: {server_info['username']}\n"
+                ),
+                _SECTION_BREAK,
+                # Query
+                _QUERY_LABEL,
+                _encode(
+                    f"{query_data['query']}\n\n"
+                    # Execution info
+                    f"Execution time: {query_data['exec_time']:.2f} seconds\n"
+                    f"Total rows returned: {query_data['total_rows']}\n"
+                    f"Databases queried: {', '.join(query_data['databases'])}\n"
+                ),
+                _SECTION_BREAK,
+                _RESULTS_LABEL,
+            ])
+            footer = _FOOTER_RULE + _encode(f"Log generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            flush_every = FileOperationsManager.LOG_FLUSH_EVERY
+
+            with open(filepath, 'wb', buffering=AppConfig.FILES['log_buffer_size']) as f:
+                f.write(header)
+                for n, result in enumerate(query_data['results'], 1):
+                    statement = f"Query {result['statement_num']}:\n" if result['statement_num'] > 0 else ""
+                    error = "" if result['success'] else f"ERROR: {result['error']}\n"
+                    f.write(_encode(f"\nDatabase: {result['database']}\n{statement}{error}{result['result']}\n"))
+                    if durable and n % flush_every == 0:
+                        f.flush()
+                f.write(footer)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
             
             return True, f"Log saved successfully to:\n{filepath}"
             
@@ -66,24 +101,26 @@ class FileOperationsManager:
 
     @staticmethod
     def generate_filename(query, timestamp):
-        """Generate filename for log file based on query and timestamp"""
-        # Generate a hash from the query for uniqueness
-        query_hash = hashlib.md5(query.encode()).hexdigest()[:8]
-        
+        """Generate filename for log file based on timestamp
+
+        query is accepted for compatibility; the millisecond timestamp alone
+        keeps names unique.
+        """
         # Format timestamp
         if isinstance(timestamp, datetime):
-            timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S")
+            timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S_%f")[:-3]
         else:
             timestamp_str = str(timestamp)
         
         # Create filename
-        filename = f"SQLTool_{timestamp_str}_{query_hash}.log"
+        filename = f"SQLTool_{timestamp_str}.log"
         return filename
 
     @staticmethod
     def save_text_file(content, default_filename=None, title="Save File"):
         """Generic method to save text content to file"""
         try:
+            from tkinter import filedialog
             filepath = filedialog.asksaveasfilename(
                 title=title,
                 initialfile=default_filename or "output.txt",
@@ -109,6 +146,7 @@ class FileOperationsManager:
             filetypes = [("Text Files", "*.txt"), ("Log Files", "*.log"), ("All Files", "*.*")]
         
         try:
+            from tkinter import filedialog
             filepath = filedialog.askopenfilename(
                 title=title,
                 filetypes=filetypes
@@ -129,6 +167,7 @@ class FileOperationsManager:
     def export_results_csv(results_data, default_filename=None):
         """Export query results to CSV format"""
         try:
+            from tkinter import filedialog
             filepath = filedialog.asksaveasfilename(
                 title="Export Results to CSV",
                 initialfile=default_filename or "query_results.csv",
@@ -139,23 +178,22 @@ class FileOperationsManager:
             if not filepath:
                 return False, "Export cancelled by user"
             
-            with open(filepath, 'w', encoding='utf-8', newline='') as f:
-                import csv
+            with open(filepath, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
                 writer = csv.writer(f)
+                writerow = writer.writerow
                 
                 # Write results data to CSV
                 for result in results_data:
                     if isinstance(result, dict) and 'rows' in result:
                         # Write headers if available
                         if result.get('headers'):
-                            writer.writerow(result['headers'])
+                            writerow(result['headers'])
                         
-                        # Write data rows
-                        for row in result['rows']:
-                            writer.writerow(row)
+                        # Write data rows; the loop runs inside the csv module
+                        writer.writerows(result['rows'])
                         
                         # Add separator between result sets
-                        writer.writerow([])
+                        writerow([])
             
             return True, f"Results exported successfully to:\n{filepath}"
             
@@ -173,16 +211,16 @@ class FileOperationsManager:
     def ensure_directory_exists(filepath):
         """Ensure the directory for the given filepath exists"""
         directory = os.path.dirname(filepath)
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory)
+        if directory:
+            # One call, and no race with another process creating it first
+            os.makedirs(directory, exist_ok=True)
         return True
 
     @staticmethod
     def get_safe_filename(filename):
         """Remove/replace unsafe characters from filename"""
-        import re
         # Remove or replace unsafe characters
-        safe_filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        safe_filename = _UNSAFE_FILENAME_RE.sub('_', filename)
         # Limit length
         if len(safe_filename) > 200:
             name, ext = os.path.splitext(safe_filename)
@@ -192,12 +230,11 @@ class FileOperationsManager:
     @staticmethod
     def format_file_size(size_bytes):
         """Format file size in human readable format"""
-        if size_bytes == 0:
+        if size_bytes <= 0:
             return "0 B"
         
-        size_names = ["B", "KB", "MB", "GB"]
-        import math
-        i = int(math.floor(math.log(size_bytes, 1024)))
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
-        return f"{s} {size_names[i]}"
+        # Each unit is 2**10 of the previous one, so the bit length picks it;
+        # fractions of a byte have bit length 0 and stay in bytes
+        i = min(max(0, (int(size_bytes).bit_length() - 1) // 10), 3)
+        s = round(size_bytes / (1 << (10 * i)), 2)
+        return f"{s} {('B', 'KB', 'MB', 'GB')[i]}"
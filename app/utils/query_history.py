@@ -1,45 +1,204 @@
 import os
+import json
 import pickle
+import threading
+from collections import deque
 from datetime import datetime
 
+class _NullLog:
+    """Stands in for the history log when the file cannot be opened"""
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
 class QueryHistoryManager:
-    HISTORY_FILE = "query_history.pkl"
+    # Append-only, one JSON record per line; compacted to the newest entries now and then
+    HISTORY_FILE = "query_history.jsonl"
+    # Pickle snapshot and its append log written by earlier versions; copied over on first load
+    LEGACY_HISTORY_FILE = "query_history.pkl"
+    LEGACY_LOG_FILE = LEGACY_HISTORY_FILE + ".jsonl"
     MAX_HISTORY_ENTRIES = 50
+    COMPACT_EVERY = 200
+    # Buffered appends reach the file after this many entries, at most this many
+    # seconds after being added, and on close
+    FLUSH_EVERY = 8
+    FLUSH_INTERVAL = 2.0
 
     def __init__(self):
-        self.query_history = []
+        # Parallel columns capped at the same length, oldest entry first
+        self._timestamps = deque(maxlen=self.MAX_HISTORY_ENTRIES)
+        self._queries = deque(maxlen=self.MAX_HISTORY_ENTRIES)
+        self._lock = threading.Lock()
+        self._adds_since_compact = 0
+        self._pending = 0
+        # Deadline flush for entries still buffered; armed by the first pending add
+        self._flush_timer = None
+        self._closed = False
         self.load_history()
+        self._log = self._open_log()
 
     def add_query(self, query):
         """Add query to history"""
-        self.query_history.append((datetime.now(), query))
-        if len(self.query_history) > self.MAX_HISTORY_ENTRIES:
-            self.query_history.pop(0)
-        self.save_history()
+        timestamp = datetime.now()
+        with self._lock:
+            self._timestamps.append(timestamp)
+            self._queries.append(query)
+            try:
+                self._log.write(self._record(timestamp, query))
+                self._pending += 1
+                if self._pending >= self.FLUSH_EVERY:
+                    self._flush_log()
+                elif self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self._flush_deadline)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+            except Exception as e:
+                print(f"Failed to append query history: {e}")
+
+        self._adds_since_compact += 1
+        if self._adds_since_compact >= self.COMPACT_EVERY:
+            self._adds_since_compact = 0
+            threading.Thread(target=self.save_history, daemon=True).start()
+
+    def _open_log(self):
+        """Open the history file for appending; history stays in memory if that fails"""
+        try:
+            return open(self.HISTORY_FILE, 'a', encoding='utf-8')
+        except OSError as e:
+            # e.g. installed into a read-only directory
+            print(f"Query history will not be saved: {e}")
+            return _NullLog()
+
+    def _cancel_flush_timer(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _flush_log(self):
+        """Push buffered entries to the file; caller holds the lock"""
+        self._cancel_flush_timer()
+        self._pending = 0
+        self._log.flush()
+
+    def _flush_deadline(self):
+        """Timer callback: flush entries that have waited FLUSH_INTERVAL"""
+        with self._lock:
+            self._flush_timer = None
+            if self._pending and not self._closed:
+                try:
+                    self._flush_log()
+                except Exception as e:
+                    print(f"Failed to flush query history: {e}")
+
+    @staticmethod
+    def _record(timestamp, query):
+        return json.dumps({"ts": timestamp.isoformat(), "q": query}) + "\n"
 
     def load_history(self):
-        """Load query history from file"""
+        """Load query history, keeping the newest entries"""
+        if not os.path.exists(self.HISTORY_FILE) and os.path.exists(self.LEGACY_HISTORY_FILE):
+            self._migrate_legacy_history()
+            return
+
         try:
             if os.path.exists(self.HISTORY_FILE):
-                with open(self.HISTORY_FILE, 'rb') as f:
-                    self.query_history = pickle.load(f)
+                self._replay(self.HISTORY_FILE)
         except Exception as e:
             print(f"Failed to load query history: {e}")
-            self.query_history = []
 
-    def save_history(self):
-        """Save query history to file"""
+    def _replay(self, path):
+        """Append every record of a JSONL history file; the deques keep the newest"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._timestamps.append(datetime.fromisoformat(record["ts"]))
+                    self._queries.append(record["q"])
+
+    def _migrate_legacy_history(self):
+        """Convert the pickle snapshot + log of older versions into the JSONL file"""
         try:
-            with open(self.HISTORY_FILE, 'wb') as f:
-                pickle.dump(self.query_history, f)
+            # One read of the whole snapshot instead of pickle's many small ones
+            with open(self.LEGACY_HISTORY_FILE, 'rb') as f:
+                entries = pickle.loads(f.read())
+            for timestamp, query in entries:
+                self._timestamps.append(timestamp)
+                self._queries.append(query)
+            if os.path.exists(self.LEGACY_LOG_FILE):
+                self._replay(self.LEGACY_LOG_FILE)
         except Exception as e:
-            print(f"Failed to save query history: {e}")
+            print(f"Failed to load legacy query history: {e}")
+            return
+
+        # The legacy files are left in place; they are not read again once the JSONL file exists
+        try:
+            self._write_history()
+        except OSError as e:
+            print(f"Failed to save migrated query history: {e}")
+
+    def _write_history(self):
+        """Rewrite the history file with only the retained entries"""
+        # Written aside and swapped in, so a crash mid-write leaves the old file intact
+        tmp_path = self.HISTORY_FILE + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("".join(map(self._record, self._timestamps, self._queries)))
+        os.replace(tmp_path, self.HISTORY_FILE)
+
+    def save_history(self):
+        """Compact the history file down to the retained entries"""
+        with self._lock:
+            # A background compaction may finish after close(); don't reopen the log then
+            if self._closed:
+                return
+            try:
+                self._log.close()
+                self._write_history()
+            except Exception as e:
+                print(f"Failed to save query history: {e}")
+            finally:
+                self._cancel_flush_timer()
+                self._pending = 0
+                self._log = self._open_log()
+
+    def close(self):
+        """Close the log, flushing entries still buffered"""
+        with self._lock:
+            self._closed = True
+            self._cancel_flush_timer()
+            self._log.close()
+
+    def __len__(self):
+        return len(self._queries)
 
     def get_history(self):
-        """Get query history"""
-        return self.query_history
+        """List of (timestamp, query) pairs, oldest first"""
+        # Snapshot; a deque may not change while it is being iterated
+        with self._lock:
+            return list(zip(self._timestamps, self._queries))
+
+    def iter_newest_first(self):
+        """Iterate (timestamp, query) pairs, newest first"""
+        return zip(reversed(self._timestamps), reversed(self._queries))
+
+    def get_entry(self, index):
+        """Get the (timestamp, query) pair at a position in oldest-first order"""
+        return self._timestamps[index], self._queries[index]
+
+    def remove_query(self, index):
+        """Delete one entry and persist the change"""
+        with self._lock:
+            del self._timestamps[index]
+            del self._queries[index]
+        self.save_history()
 
     def clear_history(self):
         """Clear all query history"""
-        self.query_history = []
-        self.save_history()
\ No newline at end of file
+        with self._lock:
+            self._timestamps.clear()
+            self._queries.clear()
+        self.save_history()
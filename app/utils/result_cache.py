@@ -0,0 +1,69 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# String literals are kept verbatim; runs of whitespace and comments collapse to one space
+_SQL_TOKEN_RE = re.compile(
+    r"('(?:[^']|'')*')|((?:\s+|--[^\n]*|/\*.*?\*/)+)|([^'\s/-]+|[/-])",
+    re.DOTALL
+)
+
+def _normalize_token(match):
+    literal, gap, other = match.groups()
+    if literal is not None:
+        return literal
+    if gap is not None:
+        return " "
+    return other.lower()
+
+def normalize_sql(sql):
+    """Canonical query text: comments and extra whitespace removed, keywords lowercased.
+
+    Literal values are left in place; replacing them with markers would need
+    a real SQL tokenizer and belongs here when added.
+    """
+    normalized = _SQL_TOKEN_RE.sub(_normalize_token, sql).strip()
+    return normalized.rstrip(";").rstrip()
+
+def fingerprint(sql):
+    """128-bit digest identifying queries that differ only in formatting"""
+    return hashlib.blake2b(normalize_sql(sql).encode(), digest_size=16).digest()
+
+class ResultCache:
+    """In-process TTL cache for per-database results of read-only queries"""
+
+    def __init__(self, ttl=30, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, server, database, query_fingerprint):
+        """Return the cached result or None if missing/expired"""
+        key = (server, database, query_fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expiry, result = entry
+            if expiry < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, server, database, query_fingerprint, result):
+        """Store a result, evicting the least recently used entry when full"""
+        key = (server, database, query_fingerprint)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
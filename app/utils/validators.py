@@ -1,13 +1,40 @@
+import functools
+import re
+
+# Anything that can change data, schema or session state disqualifies a query from caching
+_WRITE_KEYWORDS_RE = re.compile(
+    r"\b(insert|update|delete|merge|into|exec|execute|create|alter|drop|truncate|"
+    r"grant|revoke|deny|backup|restore|dbcc|use|set)\b",
+    re.IGNORECASE
+)
+_READ_PREFIX_RE = re.compile(r"^\s*(select|with)\b", re.IGNORECASE)
+
+# Single linear-time pass over the text; \s+ makes whitespace normalization unnecessary
+_DANGEROUS_RE = re.compile(
+    r"drop\s+(?:table|database)|truncate\s+table|delete\s+from|alter\s+table|update\s",
+    re.IGNORECASE
+)
+# Larger scripts are scanned directly rather than pinned in the memo cache
+_MEMO_MAX_LENGTH = 64 * 1024
+
+@functools.lru_cache(maxsize=1024)
+def _dangerous_cached(normalized: str) -> bool:
+    """Keyword scan on lowercased, whitespace-collapsed query text."""
+    return _DANGEROUS_RE.search(normalized) is not None
+
 class QueryValidator:
     @staticmethod
     def contains_dangerous_sql(query: str) -> bool:
         """Detect destructive SQL operations."""
-        lowered = query.lower()
-        destructive_keywords = [
-            "drop table", "drop database", "truncate table",
-            "delete from", "alter table", "update "
-        ]
-        return any(keyword in lowered for keyword in destructive_keywords)
+        if len(query) > _MEMO_MAX_LENGTH:
+            return _DANGEROUS_RE.search(query) is not None
+        # Queries replayed from history repeat, so memoize on the normalized text
+        return _dangerous_cached(" ".join(query.lower().split()))
+
+    @staticmethod
+    def is_read_only(query: str) -> bool:
+        """Conservatively detect plain SELECT queries whose results may be cached."""
+        return bool(_READ_PREFIX_RE.match(query)) and not _WRITE_KEYWORDS_RE.search(query)
 
     @staticmethod
     def validate_query(query: str) -> tuple[bool, str]:
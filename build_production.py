@@ -20,6 +20,9 @@ RELEASE_TYPE = "Production"
 SOURCE_FILE = "main.py"
 ICON_FILE = "assets/logo.ico"
 
+# Rule printed above and below each build step heading
+BANNER = "=" * 80
+
 # Build directories
 BUILD_DIR = "build"
 DIST_DIR = "dist"
@@ -33,9 +36,9 @@ ISCC_PATH = r"D:\Softwears\Inno Setup\Inno Setup 6\ISCC.exe"
 # ============================================================================
 def validate_environment():
     """Validate build environment and dependencies"""
-    print("=" * 80)
+    print(BANNER)
     print("VALIDATING BUILD ENVIRONMENT")
-    print("=" * 80)
+    print(BANNER)
     
     # Check if main.py exists
     if not os.path.exists(SOURCE_FILE):
@@ -109,9 +112,9 @@ def validate_environment():
 # ============================================================================
 def clean_previous_builds():
     """Remove previous build artifacts"""
-    print("=" * 80)
+    print(BANNER)
     print("CLEANING PREVIOUS BUILDS")
-    print("=" * 80)
+    print(BANNER)
     
     dirs_to_clean = [BUILD_DIR, DIST_DIR, "__pycache__"]
     files_to_clean = ["*.spec", "installer.iss"]
@@ -136,9 +139,9 @@ def clean_previous_builds():
 # ============================================================================
 def build_executable():
     """Build executable using PyInstaller"""
-    print("=" * 80)
+    print(BANNER)
     print("BUILDING EXECUTABLE")
-    print("=" * 80)
+    print(BANNER)
     
     # Prepare PyInstaller command
     pyinstaller_cmd = [
@@ -293,9 +296,9 @@ Thank you for choosing {PROJECT_NAME}!
 # ============================================================================
 def create_installer(iscc_command, release_notes_path):
     """Create Windows installer using Inno Setup"""
-    print("=" * 80)
+    print(BANNER)
     print("CREATING INSTALLER")
-    print("=" * 80)
+    print(BANNER)
     
     build_date = datetime.datetime.now().strftime("%Y-%m-%d")
     
@@ -394,6 +397,7 @@ Filename: "{{app}}\\{PROJECT_NAME}.exe"; Description: "Launch {PROJECT_NAME}"; F
 
 [UninstallDelete]
 ; Clean up on uninstall
+Type: files; Name: "{{app}}\\query_history.jsonl"
 Type: files; Name: "{{app}}\\query_history.pkl"
 Type: filesandordirs; Name: "{{app}}\\assets"
 
@@ -453,9 +457,9 @@ end;
 # ============================================================================
 def final_cleanup():
     """Clean up temporary files and show summary"""
-    print("=" * 80)
+    print(BANNER)
     print("FINAL CLEANUP")
-    print("=" * 80)
+    print(BANNER)
     
     # Remove temporary files
     temp_files = ["installer.iss"]
@@ -474,9 +478,9 @@ def final_cleanup():
 
 def show_summary():
     """Display build summary"""
-    print("=" * 80)
+    print(BANNER)
     print("BUILD SUMMARY")
-    print("=" * 80)
+    print(BANNER)
     print()
     print(f"Project: {PROJECT_NAME}")
     print(f"Version: {VERSION}")
@@ -493,9 +497,9 @@ def show_summary():
     print("  ✓ Release notes included in Start Menu shortcuts")
     print("  ✓ Release notes saved in installation directory")
     print()
-    print("=" * 80)
+    print(BANNER)
     print("✅ BUILD COMPLETED SUCCESSFULLY!")
-    print("=" * 80)
+    print(BANNER)
     print()
     print("Next Steps:")
     print("  1. Test the installer on a clean system")
@@ -510,11 +514,11 @@ def show_summary():
 def main():
     """Main build process"""
     print()
-    print("=" * 80)
+    print(BANNER)
     print(f"{PROJECT_NAME} - PRODUCTION BUILD")
     print(f"Version {VERSION}")
     print(f"{COMPANY_NAME}")
-    print("=" * 80)
+    print(BANNER)
     print()
     
     try: